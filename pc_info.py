@@ -1,1138 +1,845 @@
+# Heavy dependencies (psutil, cpuinfo, subprocess, the GUI toolkit) are imported
+# where they are first needed, so the headless mode and --help start quickly
 import os
+import re
+import sys
+import json
 import time
-import psutil
+import heapq
+import queue
 import logging
-import cpuinfo
-import requests
+import argparse
 import datetime
 import platform
+import functools
 import threading
-import subprocess
-import customtkinter as ctk
-from tkinter import messagebox, simpledialog
-from tkinter import ttk 
+from array import array
+from types import MappingProxyType
 
-# Set up logging
-def setup_logging():
-    log_dir = "Log"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-    
-    current_datetime = datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-    log_filename = os.path.join(log_dir, f"PC-Info - {current_datetime}.log")
+logger = logging.getLogger("PC-Info")
+
+# Set up logging: a debug log in ./Log plus the console for the GUI, or only
+# warnings on stderr for the headless export, which must not write files
+def setup_logging(headless=False):
+    if logger.handlers:
+        return logger  # Already configured (module loaded both as script and package)
 
-    logger = logging.getLogger("PC-Info")
     logger.setLevel(logging.DEBUG)
 
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.DEBUG)
+    console_handler.setLevel(logging.WARNING if headless else logging.DEBUG)
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
+    if headless:
+        return logger
 
-    file_handler = logging.FileHandler(log_filename)
+    log_dir = "Log"
+    current_datetime = datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+    log_filename = os.path.join(log_dir, f"PC-Info - {current_datetime}.log")
+    try:
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = logging.FileHandler(log_filename)
+    except OSError as e:
+        logger.warning(f"Logging to the console only, cannot write {log_filename}: {e}")
+        return logger
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
     logger.addHandler(file_handler)
     
     return logger
 
-logger = setup_logging()
-
-# Set the appearance mode and color theme
-ctk.set_appearance_mode("dark")  # Modes: "System" (standard), "Dark", "Light"
-ctk.set_default_color_theme("blue")  # Themes: "blue" (standard), "green", "dark-blue"
-
-class PCInfoApp(ctk.CTk):
+# Long-lived handle for one process, identified by (pid, create_time)
+class ProcessHandle:
+    __slots__ = ('process', 'create_time', 'username', 'cpu_total', 'sampled_at')
+
+    def __init__(self, process, create_time, username):
+        self.process = process
+        self.create_time = create_time
+        self.username = username  # owner, read once when the handle is opened
+        self.cpu_total = None  # user + system CPU seconds at the last sample
+        self.sampled_at = None  # monotonic time of the last sample
+
+# Creation time of the process currently holding a psutil.Process' PID, as an
+# opaque comparable value. psutil caches create_time() per object, so on Linux
+# it is taken from the /proc/<pid>/stat read that oneshot() already shares with
+# name(), ppid() and cpu_times(); elsewhere it takes a fresh psutil.Process.
+def read_create_time(process):
+    import psutil
+
+    parse_stat_file = getattr(getattr(process, "_proc", None), "_parse_stat_file", None)
+    if parse_stat_file is None:
+        return psutil.Process(process.pid).create_time()
+    try:
+        return parse_stat_file()['create_time']
+    except (FileNotFoundError, ProcessLookupError):
+        raise psutil.NoSuchProcess(process.pid)
+
+# Sample per-process CPU and memory usage using cached psutil.Process handles.
+# CPU % is the delta of cumulative CPU time over the wall-clock time elapsed
+# since the previous sample of the same process, so it stays correct no
+# matter how long the refresh interval is. A cached handle is checked against
+# the creation time read with the rest of the sample, so a reused PID gets a
+# new handle.
+class ProcessSampler:
     def __init__(self):
-        super().__init__()
-        self.title("PC Info")
-        self.resizable(width=False, height=False)
-        self.geometry("800x600")  # Set a fixed window size
-        self.protocol("WM_DELETE_WINDOW", self.on_close)  # Handle window closing event
-        
-        # Set application icon
-        self.set_app_icon()
-        
-        # For Windows, set icon again after window is fully loaded
-        if platform.system() == "Windows":
-            self.after(500, self.ensure_windows_icon)
-
-        # Check internet connection
-        if not self.check_internet_connection():
-            messagebox.showerror("Error", "Internet connection is required to run this application.")
-            self.destroy()  # Close the window if there's no internet connection
-            return
-
-        # Create menu bar frame
-        self.menu_bar = ctk.CTkFrame(self, height=40)
-        self.menu_bar.pack(fill="x", padx=0, pady=0)
-        self.menu_bar.pack_propagate(False)
-
-        # File Menu
-        self.file_menu_button = ctk.CTkOptionMenu(
-            self.menu_bar, 
-            values=["Exit"],
-            command=self.file_menu_callback,
-            width=60,
-            height=30
-        )
-        self.file_menu_button.pack(side="left", padx=5, pady=5)
-        self.file_menu_button.set("File")
-
-        # View Menu
-        self.view_menu_button = ctk.CTkOptionMenu(
-            self.menu_bar,
-            values=["System Info", "Processes", "Refresh Now", "End Selected Process"],
-            command=self.view_menu_callback,
-            width=60,
-            height=30
-        )
-        self.view_menu_button.pack(side="left", padx=5, pady=5)
-        self.view_menu_button.set("View")
-
-        # Settings Menu
-        self.settings_menu_button = ctk.CTkOptionMenu(
-            self.menu_bar,
-            values=["Change Update Interval", "Theme: Dark", "Theme: Light", "Theme: System"],
-            command=self.settings_menu_callback,
-            width=80,
-            height=30
-        )
-        self.settings_menu_button.pack(side="left", padx=5, pady=5)
-        self.settings_menu_button.set("Settings")
-
-        # Help Menu
-        self.help_menu_button = ctk.CTkOptionMenu(
-            self.menu_bar,
-            values=["About"],
-            command=self.help_menu_callback,
-            width=60,
-            height=30
-        )
-        self.help_menu_button.pack(side="left", padx=5, pady=5)
-        self.help_menu_button.set("Help")
-
-        # Status label on the right side
-        self.status_label = ctk.CTkLabel(self.menu_bar, text="Ready")
-        self.status_label.pack(side="right", padx=10, pady=5)
-
-        # Create tabview for organizing content
-        self.tabview = ctk.CTkTabview(self, width=780, height=500)
-        self.tabview.pack(fill="both", expand=True, padx=10, pady=5)
-        
-        # Add tabs
-        self.tabview.add("System Info")
-        self.tabview.add("Processes")
-        
-        # Create frame for system info content
-        self.info_frame = ctk.CTkFrame(self.tabview.tab("System Info"))
-        self.info_frame.pack(fill="both", expand=True, padx=10, pady=10)
-        
-        # Create text widget for system information (read-only)
-        self.text_display = ctk.CTkTextbox(self.info_frame, state="disabled")
-        self.text_display.pack(fill="both", expand=True, padx=10, pady=(10, 5))
-        
-        # Create copy button
-        self.copy_button = ctk.CTkButton(
-            self.info_frame,
-            text="Copy System Info to Clipboard",
-            command=self.copy_system_info,
-            height=30
-        )
-        self.copy_button.pack(pady=(0, 10))
-
-        # Create frame for treeview in processes tab
-        self.tree_frame = ctk.CTkFrame(self.tabview.tab("Processes"))
-        self.tree_frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-        # Create treeview to display processes
-        self.processes_tree = ttk.Treeview(self.tree_frame, columns=("name", "cpu_percent", "memory_percent"))
-        self.processes_tree.heading("#0", text="PID")
-        self.processes_tree.heading("name", text="Process Name")
-        self.processes_tree.heading("cpu_percent", text="CPU Usage %")
-        self.processes_tree.heading("memory_percent", text="Memory %")
-        
-        # Improved column widths for better readability
-        self.processes_tree.column("#0", width=80, minwidth=60)
-        self.processes_tree.column("name", width=300, minwidth=200)
-        self.processes_tree.column("cpu_percent", width=120, minwidth=100)
-        self.processes_tree.column("memory_percent", width=120, minwidth=100)
-        
-        # Style the treeview for dark theme
-        self.setup_treeview_style()
-        
-        # Add context menu for process management
-        self.setup_process_context_menu()
-        
-        # Bind keyboard events for process management
-        self.processes_tree.bind('<Delete>', self.kill_selected_process_key)
-        self.processes_tree.bind('<Button-3>', self.show_context_menu)  # Right click
-        self.processes_tree.bind('<<TreeviewSelect>>', self.on_process_select)  # Selection changed
-        self.processes_tree.bind('<Button-1>', self.on_process_click)  # Left click
-        
-        # Bind column header clicks for sorting
-        self.processes_tree.heading("#0", command=lambda: self.sort_processes("pid"))
-        self.processes_tree.heading("name", command=lambda: self.sort_processes("name"))
-        self.processes_tree.heading("cpu_percent", command=lambda: self.sort_processes("cpu_percent"))
-        self.processes_tree.heading("memory_percent", command=lambda: self.sort_processes("memory_percent"))
-        
-        self.processes_tree.pack(fill="both", expand=True, padx=5, pady=5)
-
-        # Initialize update interval
-        self.update_interval = 5
-
-        # Initialize update interval button
-        self.update_interval_button = None
-        
-        # Track selection state to pause updates
-        self.process_selected = False
-        self.last_selected_pid = None
-        
-        # Track sorting state
-        self.sort_column = "cpu_percent"  # Default sort column
-        self.sort_reverse = True  # Default to descending (highest CPU first)
-
-        # Load system information
-        self.system_info = get_system_info()
-        
-        # Load GPU information once and cache it
-        self.gpu_info = get_gpu_info()
-        
-        # Flag to track if system info display is initialized
-        self.system_info_displayed = False
-
-        if not self.system_info:
-            self.update_information()
-        else:
-            self.display_complete_system_info()  # Display all system info once
-            self.display_processes()  # Display processes when opening
+        self.handles = {}  # pid -> ProcessHandle
+        self.lock = threading.Lock()
 
-        # Start the update thread
-        self.update_thread = threading.Thread(target=self.update_information_threaded, daemon=True)
-        self.update_thread.start()
-
-    # Set application icon for all platforms
-    def set_app_icon(self):
-        try:
-            # Get the directory where the script is located
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            icon_path = os.path.join(script_dir, "icon.png")
-            
-            # Check if icon file exists
-            if os.path.exists(icon_path):
-                icon_set = False
-                
-                # Windows-specific icon handling
-                if platform.system() == "Windows":
-                    # First try to convert and use ICO format
-                    ico_path = icon_path.replace('.png', '.ico')
-                    
-                    # Create ICO file if it doesn't exist
-                    if not os.path.exists(ico_path):
-                        if self.create_ico_from_png(icon_path, ico_path):
-                            logger.info(f"Created ICO file: {ico_path}")
-                    
-                    # Try to use ICO file
-                    if os.path.exists(ico_path):
-                        try:
-                            self.iconbitmap(ico_path)
-                            icon_set = True
-                            logger.info(f"Windows icon set using ICO: {ico_path}")
-                        except Exception as e:
-                            logger.warning(f"Could not set ICO icon: {e}")
-                    
-                    # If ICO failed, try PNG with PhotoImage
-                    if not icon_set:
-                        try:
-                            import tkinter as tk
-                            # Wait for window to be fully initialized
-                            self.update()
-                            photo = tk.PhotoImage(file=icon_path)
-                            self.iconphoto(True, photo)
-                            # Keep reference to prevent garbage collection
-                            self.icon_photo = photo
-                            icon_set = True
-                            logger.info(f"Windows icon set using PhotoImage: {icon_path}")
-                        except Exception as e:
-                            logger.warning(f"Could not set PhotoImage icon: {e}")
-                
-                else:
-                    # Non-Windows systems (macOS, Linux)
-                    try:
-                        import tkinter as tk
-                        photo = tk.PhotoImage(file=icon_path)
-                        self.iconphoto(True, photo)
-                        self.icon_photo = photo
-                        icon_set = True
-                        logger.info(f"Icon set using PhotoImage: {icon_path}")
-                    except Exception as e:
-                        logger.warning(f"Could not set PhotoImage icon: {e}")
-                
-                if not icon_set:
-                    self.set_fallback_icon()
-                else:
-                    # Set additional Windows taskbar properties
-                    if platform.system() == "Windows":
-                        self.set_windows_properties()
-                    
-            else:
-                logger.warning(f"Icon file not found: {icon_path}")
-                self.set_fallback_icon()
-                
-        except Exception as e:
-            logger.error(f"Error setting application icon: {e}")
-            self.set_fallback_icon()
+    # Return a list of process info dicts (pid, ppid, name, username, cpu_percent, memory_percent)
+    def sample(self):
+        import psutil
 
-    # Create ICO file from PNG
-    def create_ico_from_png(self, png_path, ico_path):
-        try:
-            from PIL import Image
-            
-            with Image.open(png_path) as img:
-                # Convert to RGBA if not already
-                if img.mode != 'RGBA':
-                    img = img.convert('RGBA')
-                
-                # Create multiple sizes for better Windows compatibility
-                icon_sizes = [(16, 16), (32, 32), (48, 48), (64, 64), (128, 128), (256, 256)]
-                
-                # Resize and save as ICO
-                img.save(ico_path, format='ICO', sizes=icon_sizes)
-                return True
-                
-        except ImportError:
-            logger.warning("PIL (Pillow) not available - cannot convert PNG to ICO")
-            return False
-        except Exception as e:
-            logger.warning(f"Could not create ICO from PNG: {e}")
-            return False
+        with self.lock:
+            processes = []
+            pids = psutil.pids()
 
-    # Set Windows-specific properties
-    def set_windows_properties(self):
-        try:
-            if platform.system() == "Windows":
-                # Set application user model ID for proper taskbar grouping
-                import ctypes
-                try:
-                    ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID("PCInfo.SystemMonitor.1.0")
-                    logger.info("Windows App User Model ID set")
-                except Exception as e:
-                    logger.warning(f"Could not set App User Model ID: {e}")
-                    
-                # Try to set window icon using Windows API as fallback
+            for pid in pids:
+                handle = self.handles.get(pid)
                 try:
-                    script_dir = os.path.dirname(os.path.abspath(__file__))
-                    ico_path = os.path.join(script_dir, "icon.ico")
-                    
-                    if os.path.exists(ico_path):
-                        # Get window handle after window is shown
-                        self.after(100, lambda: self.set_window_icon_winapi(ico_path))
-                except Exception as e:
-                    logger.warning(f"Could not prepare Windows API icon: {e}")
-                    
-        except Exception as e:
-            logger.warning(f"Could not set Windows properties: {e}")
+                    if handle is None:
+                        handle = self.open_handle(pid)
+                    info = self.read(handle)
+                    if info is None:
+                        # Different creation time: the PID was reused
+                        handle = self.open_handle(pid)
+                        info = self.read(handle)
+                except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                    self.handles.pop(pid, None)
+                    continue
+                except psutil.AccessDenied:
+                    continue
 
-    # Set window icon using Windows API
-    def set_window_icon_winapi(self, ico_path):
-        try:
-            import ctypes
-            from ctypes import wintypes
-            
-            # Get window handle
-            hwnd = self.winfo_id()
-            
-            # Load icon
-            user32 = ctypes.windll.user32
-            kernel32 = ctypes.windll.kernel32
-            
-            # Constants
-            IMAGE_ICON = 1
-            LR_LOADFROMFILE = 0x00000010
-            LR_DEFAULTSIZE = 0x00000040
-            
-            WM_SETICON = 0x0080
-            ICON_SMALL = 0
-            ICON_BIG = 1
-            
-            # Load icon from file
-            hicon_small = user32.LoadImageW(
-                None,
-                ico_path,
-                IMAGE_ICON,
-                16, 16,
-                LR_LOADFROMFILE | LR_DEFAULTSIZE
-            )
-            
-            hicon_large = user32.LoadImageW(
-                None,
-                ico_path,
-                IMAGE_ICON,
-                32, 32,
-                LR_LOADFROMFILE | LR_DEFAULTSIZE
-            )
-            
-            if hicon_small:
-                user32.SendMessageW(hwnd, WM_SETICON, ICON_SMALL, hicon_small)
-                logger.info("Small window icon set via Windows API")
-                
-            if hicon_large:
-                user32.SendMessageW(hwnd, WM_SETICON, ICON_BIG, hicon_large)
-                logger.info("Large window icon set via Windows API")
-                
-        except Exception as e:
-            logger.warning(f"Could not set icon via Windows API: {e}")
+                if info['name'] != 'System Idle Process':
+                    processes.append(info)
 
-    # Ensure Windows icon is properly set after window initialization
-    def ensure_windows_icon(self):
-        try:
-            if platform.system() == "Windows":
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                icon_path = os.path.join(script_dir, "icon.png")
-                ico_path = os.path.join(script_dir, "icon.ico")
-                
-                # Try ICO first if available
-                if os.path.exists(ico_path):
-                    try:
-                        self.iconbitmap(ico_path)
-                        logger.info("Windows icon re-applied using ICO")
-                    except Exception as e:
-                        logger.warning(f"Could not re-apply ICO icon: {e}")
-                        # Try PNG fallback
-                        if os.path.exists(icon_path):
-                            try:
-                                import tkinter as tk
-                                photo = tk.PhotoImage(file=icon_path)
-                                self.iconphoto(True, photo)
-                                self.icon_photo = photo
-                                logger.info("Windows icon re-applied using PhotoImage")
-                            except Exception as e2:
-                                logger.warning(f"Could not re-apply PhotoImage icon: {e2}")
-                
-                # Set Windows API icon as additional measure
-                if os.path.exists(ico_path):
-                    self.set_window_icon_winapi(ico_path)
-                    
-        except Exception as e:
-            logger.warning(f"Error in ensure_windows_icon: {e}")
+            # Evict handles of processes that have exited
+            alive = set(pids)
+            for pid in [pid for pid in self.handles if pid not in alive]:
+                del self.handles[pid]
 
-    # Alternative method to set icon using base64 encoded data (fallback)
-    def set_fallback_icon(self):
-        try:
-            # For Windows, try a different approach with emoji
-            if platform.system() == "Windows":
-                self.title("PC Info 🖥️")  # Add computer emoji to title
-                # Try to set a basic system icon
-                try:
-                    import tkinter as tk
-                    # Create a simple colored square as fallback icon
-                    fallback_icon = tk.PhotoImage(width=32, height=32)
-                    fallback_icon.put("#1f538d", to=(0, 0, 32, 32))  # Blue square
-                    self.iconphoto(True, fallback_icon)
-                    self.fallback_icon_ref = fallback_icon  # Keep reference
-                    logger.info("Using fallback colored icon")
-                except Exception:
-                    logger.info("Using emoji in title as final fallback")
-            else:
-                # For other systems
-                self.title("PC Info 🖥️")
-                logger.info("Using emoji in title as icon fallback")
-            
-        except Exception as e:
-            logger.warning(f"Could not set fallback icon: {e}")
-            # Last resort - just change title
-            try:
-                self.title("PC Info")
-            except:
-                pass
+            return processes
 
-    # Check internet connection
-    def check_internet_connection(self):
-        try:
-            requests.get("http://www.google.com", timeout=3)
-            return True
-        except requests.ConnectionError:
-            return False
+    # Create and cache a handle for a PID
+    def open_handle(self, pid):
+        import psutil
 
-    # Setup treeview style for better theme integration
-    def setup_treeview_style(self):
-        style = ttk.Style()
-        
-        # Configure colors based on current appearance mode
-        current_mode = ctk.get_appearance_mode()
-        
-        if current_mode == "Dark":
-            # Dark theme colors
-            bg_color = "#212121"
-            fg_color = "#ffffff"
-            select_bg = "#1f538d"
-            select_fg = "#ffffff"
-            field_bg = "#2b2b2b"
-            heading_bg = "#2b2b2b"
-        else:
-            # Light theme colors
-            bg_color = "#ffffff"
-            fg_color = "#000000"
-            select_bg = "#0078d4"
-            select_fg = "#ffffff"
-            field_bg = "#f0f0f0"
-            heading_bg = "#e1e1e1"
-        
-        # Configure treeview style with better readability
-        style.theme_use('clam')
-        style.configure("Treeview",
-                       background=bg_color,
-                       foreground=fg_color,
-                       fieldbackground=field_bg,
-                       borderwidth=1,
-                       relief="solid",
-                       font=('Segoe UI', 10, 'normal'),  # Larger, clearer font
-                       rowheight=25)  # Increased row height for better readability
-        
-        # Configure alternating row colors for better readability
-        if current_mode == "Dark":
-            alternate_color = "#2d2d2d"
-        else:
-            alternate_color = "#f8f8f8"
-            
-        self.processes_tree.tag_configure('oddrow', background=field_bg)
-        self.processes_tree.tag_configure('evenrow', background=alternate_color)
-        
-        style.configure("Treeview.Heading",
-                       background=heading_bg,
-                       foreground=fg_color,
-                       borderwidth=1,
-                       relief="solid",
-                       font=('Segoe UI', 11, 'bold'))  # Bold headers with larger font
-        
-        style.map("Treeview",
-                 background=[('selected', select_bg)],
-                 foreground=[('selected', select_fg)])
-        
-        style.map("Treeview.Heading",
-                 background=[('active', heading_bg)],
-                 foreground=[('active', fg_color)])
-
-    # Setup context menu for process management
-    def setup_process_context_menu(self):
-        import tkinter as tk
-        self.context_menu = tk.Menu(self, tearoff=0)
-        self.context_menu.add_command(label="End Process", command=self.kill_selected_process)
-        self.context_menu.add_separator()
-        self.context_menu.add_command(label="Refresh Process List", command=self.manual_refresh)
-
-    # Show context menu on right click
-    def show_context_menu(self, event):
-        # Select the item under the cursor
-        item = self.processes_tree.identify_row(event.y)
-        if item:
-            self.processes_tree.selection_set(item)
-            self.processes_tree.focus(item)
-            # Show context menu
+        process = psutil.Process(pid)
+        try:
+            username = process.username()
+        except psutil.AccessDenied:
+            username = None
+        handle = ProcessHandle(process, read_create_time(process), username)
+        self.handles[pid] = handle
+        return handle
+
+    # Read one sample from a handle, or None if its PID now belongs to another process
+    def read(self, handle):
+        import psutil
+
+        process = handle.process
+        with process.oneshot():
+            if read_create_time(process) != handle.create_time:
+                return None
+            name = process.name()
+            ppid = process.ppid()
+            try:
+                cpu_times = process.cpu_times()
+                cpu_total = cpu_times.user + cpu_times.system
+            except psutil.AccessDenied:
+                cpu_total = None
             try:
-                self.context_menu.tk_popup(event.x_root, event.y_root)
-            finally:
-                self.context_menu.grab_release()
-
-    # Handle process selection
-    def on_process_select(self, event):
-        selected_items = self.processes_tree.selection()
-        if selected_items:
-            self.process_selected = True
-            # Get PID of selected process
-            selected_item = selected_items[0]
-            self.last_selected_pid = self.processes_tree.item(selected_item)['text']
-            self.status_label.configure(text="Process selected - Updates paused")
+                memory_percent = process.memory_percent()
+            except psutil.AccessDenied:
+                memory_percent = None
+        now = time.monotonic()
+
+        cpu_percent = 0.0
+        if cpu_total is None:
+            cpu_percent = None
+        elif handle.cpu_total is not None:
+            cpu_delta = cpu_total - handle.cpu_total
+            elapsed = now - handle.sampled_at
+            if elapsed > 0:
+                cpu_percent = cpu_delta / elapsed * 100
+
+        handle.cpu_total = cpu_total
+        handle.sampled_at = now
+        return {
+            'pid': process.pid,
+            'ppid': ppid,
+            'name': name,
+            'username': handle.username,
+            'cpu_percent': cpu_percent,
+            'memory_percent': memory_percent,
+        }
+
+# Parent/child hierarchy of a process snapshot with CPU and memory usage rolled
+# up per subtree. Everything comes from the ppid the sampler already read, so
+# building it is one pass to link the nodes and one walk to sum the subtrees,
+# without any further psutil calls. Children keep the order of the snapshot.
+class ProcessTree:
+    def __init__(self, processes):
+        self.processes = {}  # pid -> process info dict
+        self.children = {}  # pid -> child pids
+        self.roots = []
+        self.total_cpu = {}  # pid -> CPU % of the process and all its descendants
+        self.total_memory = {}  # pid -> memory % of the process and all its descendants
+        self.descendants = {}  # pid -> number of descendants
+
+        for proc_info in processes:
+            self.processes.setdefault(proc_info['pid'], proc_info)
+
+        # Link every process to its parent, or make it a root if the parent is not in the snapshot
+        for pid in self.processes:
+            self.children[pid] = []
+        for pid, proc_info in self.processes.items():
+            ppid = proc_info.get('ppid')
+            if ppid != pid and ppid in self.processes:
+                self.children[ppid].append(pid)
+            else:
+                self.roots.append(pid)
+
+        # Walk the tree top-down; nodes not reached from a root sit on a ppid
+        # cycle (a reused PID), which is broken by promoting them to roots
+        order = self.walk(self.roots)
+        if len(order) < len(self.processes):
+            reached = set(order)
+            for pid in self.processes:
+                if pid not in reached:
+                    self.children[self.processes[pid]['ppid']].remove(pid)
+                    self.roots.append(pid)
+                    walked = self.walk([pid])
+                    reached.update(walked)
+                    order.extend(walked)
+
+        # Children come after their parent in the walk, so summing in reverse
+        # order finishes every subtree before it is added to its parent
+        for pid in order:
+            proc_info = self.processes[pid]
+            self.total_cpu[pid] = proc_info['cpu_percent'] or 0.0
+            self.total_memory[pid] = proc_info['memory_percent'] or 0.0
+            self.descendants[pid] = 0
+        roots = set(self.roots)
+        for pid in reversed(order):
+            if pid not in roots:
+                ppid = self.processes[pid]['ppid']
+                self.total_cpu[ppid] += self.total_cpu[pid]
+                self.total_memory[ppid] += self.total_memory[pid]
+                self.descendants[ppid] += self.descendants[pid] + 1
+
+    # PIDs of the given subtrees, parents before children
+    def walk(self, pids):
+        order = []
+        stack = list(reversed(pids))
+        while stack:
+            pid = stack.pop()
+            order.append(pid)
+            stack.extend(reversed(self.children[pid]))
+        return order
+
+# Processes that must never be terminated
+CRITICAL_PROCESSES = ['System', 'Registry', 'csrss.exe', 'winlogon.exe', 'services.exe', 'lsass.exe', 'svchost.exe']
+
+# Qualifiers understood in process queries ("user:alice", "re:^python", ...)
+PROCESS_QUERY_QUALIFIERS = ("name", "re", "user", "cgroup", "pid")
+
+# Split a process query into (qualifier, value) terms, qualifier is None for bare words
+def split_process_query(query, qualifiers=PROCESS_QUERY_QUALIFIERS):
+    terms = []
+    for token in query.split():
+        qualifier, separator, value = token.partition(":")
+        if separator and qualifier.lower() in qualifiers:
+            terms.append((qualifier.lower(), value))
         else:
-            self.process_selected = False
-            self.last_selected_pid = None
-            self.status_label.configure(text="Ready")
-
-    # Handle left click to potentially deselect
-    def on_process_click(self, event):
-        # Check if click is on empty area
-        item = self.processes_tree.identify_row(event.y)
-        if not item:
-            # Clicked on empty area, clear selection
-            self.processes_tree.selection_remove(self.processes_tree.selection())
-            self.process_selected = False
-            self.last_selected_pid = None
-            self.status_label.configure(text="Ready")
-
-    # Sort processes by column
-    def sort_processes(self, column):
-        # Toggle sort direction if clicking the same column
-        if self.sort_column == column:
-            self.sort_reverse = not self.sort_reverse
+            terms.append((None, token))
+    return terms
+
+# Control group path of a process (Linux only), or None
+def read_process_cgroup(pid):
+    try:
+        with open(f"/proc/{pid}/cgroup") as f:
+            return f.read()
+    except OSError:
+        return None
+
+# Find the processes matching every term of a kill query:
+#   name:NAME or NAME   exact process name (case-insensitive)
+#   re:PATTERN          regular expression searched in the process name
+#   user:USER           owning user
+#   cgroup:PATH         part of the process' control group path (Linux)
+#   pid:PID             process ID
+# Returns (pid, name) pairs, never including this process itself.
+# Raises ValueError for an empty query or an invalid regular expression.
+def find_matching_processes(query):
+    import psutil
+
+    terms = split_process_query(query)
+    if not terms:
+        raise ValueError("Empty process query")
+
+    checks = []
+    needs_username = False
+    for qualifier, value in terms:
+        if qualifier in (None, "name"):
+            name = value.casefold()
+            checks.append(lambda info, name=name: (info['name'] or "").casefold() == name)
+        elif qualifier == "re":
+            try:
+                pattern = re.compile(value)
+            except re.error as e:
+                raise ValueError(f"Invalid regular expression {value!r}: {e}")
+            checks.append(lambda info, pattern=pattern: pattern.search(info['name'] or "") is not None)
+        elif qualifier == "user":
+            needs_username = True
+            checks.append(lambda info, user=value: (info['username'] or "").casefold() == user.casefold()
+                          or (info['username'] or "").split("\\")[-1].casefold() == user.casefold())
+        elif qualifier == "cgroup":
+            checks.append(lambda info, path=value: path in (read_process_cgroup(info['pid']) or ""))
+        elif qualifier == "pid":
+            try:
+                pid = int(value)
+            except ValueError:
+                raise ValueError(f"Invalid PID {value!r}")
+            checks.append(lambda info, pid=pid: info['pid'] == pid)
+
+    own_pid = os.getpid()
+    attrs = ['pid', 'name', 'username'] if needs_username else ['pid', 'name']
+    matches = []
+    for proc in psutil.process_iter(attrs):
+        info = proc.info
+        if info['pid'] != own_pid and all(check(info) for check in checks):
+            matches.append((info['pid'], info['name']))
+    return matches
+
+# Qualifiers understood by the process table filter
+PROCESS_FILTER_QUALIFIERS = ("name", "re", "user", "pid")
+
+# Typed sort key of each sortable process column; None sorts as zero
+PROCESS_SORT_KEYS = {
+    "pid": lambda proc_info: proc_info['pid'],
+    "name": lambda proc_info: (proc_info['name'] or "").lower(),
+    "cpu_percent": lambda proc_info: proc_info['cpu_percent'] or 0.0,
+    "memory_percent": lambda proc_info: proc_info['memory_percent'] or 0.0,
+}
+
+# Number of rows shown by the process table's top-N mode
+TOP_PROCESSES = 50
+
+# Searchable, sortable index over a process snapshot for the process table.
+# Lowercase names, users and PIDs are prepared once per snapshot, so a query
+# is a plain scan over prepared strings. A query that only extends the
+# previous one (another typed character) scans just the previous matches.
+#   text or name:TEXT   substring of the process name (case-insensitive)
+#   re:PATTERN          regular expression searched in the process name
+#   user:TEXT           substring of the owning user
+#   pid:DIGITS          PIDs starting with the digits
+# Terms are combined with AND. filter_indices() and view() raise ValueError
+# for an invalid regular expression. Sort keys are extracted once per column, and
+# view() with a limit selects the top rows with a heap instead of sorting all.
+# An index is not thread-safe; build and query it on one thread.
+class ProcessIndex:
+    def __init__(self, processes):
+        self.processes = processes
+        self.names = [(proc_info['name'] or "").lower() for proc_info in processes]
+        self.users = [(proc_info.get('username') or "").lower() for proc_info in processes]
+        self.pids = [str(proc_info['pid']) for proc_info in processes]
+        self.sort_keys = {"name": self.names}
+        self.last_terms = []
+        self.last_matches = None  # indices matching last_terms
+
+    # Indices of the processes matching a filter query
+    def filter_indices(self, query):
+        terms = split_process_query(query, PROCESS_FILTER_QUALIFIERS)
+        if not terms:
+            self.last_terms, self.last_matches = [], None
+            return range(len(self.processes))
+
+        if self.narrows(terms):
+            candidates = self.last_matches
         else:
-            self.sort_column = column
-            # Set default sort direction for each column
-            if column == "pid":
-                self.sort_reverse = False  # PID ascending by default
-            elif column == "name":
-                self.sort_reverse = False  # Name ascending by default
-            elif column in ["cpu_percent", "memory_percent"]:
-                self.sort_reverse = True  # CPU/Memory descending by default
-        
-        # Update column headers to show sort direction
-        self.update_column_headers()
-        
-        # Refresh the process list with new sorting
-        if not self.process_selected:
-            self.display_processes_threaded()
+            candidates = range(len(self.processes))
+
+        for qualifier, value in terms:
+            candidates = self.match(qualifier, value, candidates)
+
+        self.last_terms, self.last_matches = terms, candidates
+        return candidates
+
+    # Sort key of every process for one column, extracted once per snapshot
+    def keys(self, column):
+        keys = self.sort_keys.get(column)
+        if keys is None:
+            keys = list(map(PROCESS_SORT_KEYS[column], self.processes))
+            self.sort_keys[column] = keys
+        return keys
+
+    # Matching processes sorted by column (at most limit of them) and the match count
+    def view(self, query, column, reverse, limit=None):
+        candidates = self.filter_indices(query)
+        key = self.keys(column).__getitem__
+        if limit is not None and len(candidates) > limit:
+            select = heapq.nlargest if reverse else heapq.nsmallest
+            order = select(limit, candidates, key=key)
         else:
-            # If a process is selected, update immediately
-            self.display_processes()
-
-    # Update column headers to show sort indicators
-    def update_column_headers(self):
-        # Reset all headers
-        self.processes_tree.heading("#0", text="PID")
-        self.processes_tree.heading("name", text="Process Name")
-        self.processes_tree.heading("cpu_percent", text="CPU Usage %")
-        self.processes_tree.heading("memory_percent", text="Memory %")
-        
-        # Add sort indicator to current sort column
-        sort_indicator = " ↓" if self.sort_reverse else " ↑"
-        
-        if self.sort_column == "pid":
-            self.processes_tree.heading("#0", text=f"PID{sort_indicator}")
-        elif self.sort_column == "name":
-            self.processes_tree.heading("name", text=f"Process Name{sort_indicator}")
-        elif self.sort_column == "cpu_percent":
-            self.processes_tree.heading("cpu_percent", text=f"CPU Usage %{sort_indicator}")
-        elif self.sort_column == "memory_percent":
-            self.processes_tree.heading("memory_percent", text=f"Memory %{sort_indicator}")
-
-    # Get sort key for a process
-    def get_sort_key(self, proc_info):
-        if self.sort_column == "pid":
-            return int(proc_info.get('pid', 0))
-        elif self.sort_column == "name":
-            return proc_info.get('name', '').lower()
-        elif self.sort_column == "cpu_percent":
-            return float(proc_info.get('cpu_percent', 0) or 0)
-        elif self.sort_column == "memory_percent":
-            return float(proc_info.get('memory_percent', 0) or 0)
-        return 0
-
-    # Kill selected process via keyboard shortcut (Delete key)
-    def kill_selected_process_key(self, event):
-        self.kill_selected_process()
-
-    # Kill the selected process
-    def kill_selected_process(self):
-        selected_item = self.processes_tree.selection()
-        if not selected_item:
-            messagebox.showwarning("No Selection", "Please select a process to terminate.")
-            return
-
-        # Get PID from the selected item
-        pid_str = self.processes_tree.item(selected_item[0])['text']
-        process_name = self.processes_tree.item(selected_item[0])['values'][0]
-        
-        try:
-            pid = int(pid_str)
-            
-            # Confirm before killing the process
-            result = messagebox.askyesno(
-                "Confirm Process Termination",
-                f"Are you sure you want to terminate the process?\n\n"
-                f"Process: {process_name}\n"
-                f"PID: {pid}\n\n"
-                f"Warning: Terminating system processes may cause instability!"
-            )
-            
-            if result:
-                try:
-                    process = psutil.Process(pid)
-                    process_name_actual = process.name()
-                    
-                    # Check if it's a critical system process
-                    critical_processes = ['System', 'Registry', 'csrss.exe', 'winlogon.exe', 'services.exe', 'lsass.exe', 'svchost.exe']
-                    if process_name_actual in critical_processes:
-                        messagebox.showerror(
-                            "Cannot Terminate Process",
-                            f"Cannot terminate critical system process: {process_name_actual}\n"
-                            f"This could cause system instability or crash."
-                        )
-                        return
-                    
-                    # Try graceful termination first
-                    process.terminate()
-                    
-                    # Wait a bit for graceful termination
-                    try:
-                        process.wait(timeout=3)
-                        self.status_label.configure(text=f"Process {process_name} terminated")
-                        logger.info(f"Successfully terminated process: {process_name} (PID: {pid})")
-                    except psutil.TimeoutExpired:
-                        # Force kill if graceful termination failed
-                        process.kill()
-                        self.status_label.configure(text=f"Process {process_name} force killed")
-                        logger.info(f"Force killed process: {process_name} (PID: {pid})")
-                    
-                    # Reset status after 3 seconds
-                    self.after(3000, lambda: self.status_label.configure(text="Ready"))
-                    
-                    # Clear selection and resume updates
-                    self.process_selected = False
-                    self.last_selected_pid = None
-                    
-                    # Refresh the process list
-                    self.display_processes()
-                    
-                except psutil.NoSuchProcess:
-                    messagebox.showinfo("Process Not Found", f"Process with PID {pid} no longer exists.")
-                except psutil.AccessDenied:
-                    messagebox.showerror(
-                        "Access Denied", 
-                        f"Access denied. Cannot terminate process: {process_name}\n"
-                        f"You may need administrator privileges to terminate this process."
-                    )
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to terminate process: {str(e)}")
-                    logger.error(f"Failed to terminate process {process_name} (PID: {pid}): {str(e)}")
-                    
-        except ValueError:
-            messagebox.showerror("Error", "Invalid process ID.")
-        except Exception as e:
-            messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
-            logger.error(f"Unexpected error in kill_selected_process: {str(e)}")
+            order = sorted(candidates, key=key, reverse=reverse)
+        return list(map(self.processes.__getitem__, order)), len(candidates)
 
-    # Copy system information to clipboard
-    def copy_system_info(self):
-        try:
-            # Get all text content
-            content = self.text_display.get("0.0", "end-1c")
-            
-            # Copy to clipboard
-            self.clipboard_clear()
-            self.clipboard_append(content)
-            
-            # Show confirmation
-            self.status_label.configure(text="System info copied to clipboard")
-            self.after(3000, lambda: self.status_label.configure(text="Ready"))
-            
-            logger.info("System information copied to clipboard")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to copy to clipboard: {str(e)}")
-            logger.error(f"Error copying to clipboard: {e}")
-
-    # Menu callback functions
-    def file_menu_callback(self, choice):
-        if choice == "Exit":
-            self.destroy()
-        # Reset the menu to show "File" again
-        self.file_menu_button.set("File")
-
-    def view_menu_callback(self, choice):
-        if choice == "System Info":
-            self.tabview.set("System Info")
-        elif choice == "Processes":
-            self.tabview.set("Processes")
-        elif choice == "Refresh Now":
-            self.manual_refresh()
-            self.status_label.configure(text="Refreshed")
-            self.after(2000, lambda: self.status_label.configure(text="Ready"))
-        elif choice == "End Selected Process":
-            self.tabview.set("Processes")  # Switch to processes tab first
-            self.kill_selected_process()
-        # Reset the menu to show "View" again
-        self.view_menu_button.set("View")
-
-    def settings_menu_callback(self, choice):
-        if choice == "Change Update Interval":
-            self.change_update_interval()
-        elif choice == "Theme: Dark":
-            ctk.set_appearance_mode("dark")
-            self.setup_treeview_style()  # Update treeview style
-            self.status_label.configure(text="Theme changed to Dark")
-            self.after(2000, lambda: self.status_label.configure(text="Ready"))
-        elif choice == "Theme: Light":
-            ctk.set_appearance_mode("light")
-            self.setup_treeview_style()  # Update treeview style
-            self.status_label.configure(text="Theme changed to Light")
-            self.after(2000, lambda: self.status_label.configure(text="Ready"))
-        elif choice == "Theme: System":
-            ctk.set_appearance_mode("system")
-            self.setup_treeview_style()  # Update treeview style
-            self.status_label.configure(text="Theme changed to System")
-            self.after(2000, lambda: self.status_label.configure(text="Ready"))
-        # Reset the menu to show "Settings" again
-        self.settings_menu_button.set("Settings")
-
-    def help_menu_callback(self, choice):
-        if choice == "About":
-            messagebox.showinfo("About PC Info", 
-                              "PC Info v2.1\n"
-                              "A system information tool\n"
-                              "Built with CustomTkinter\n\n"
-                              "Features:\n"
-                              "• System Hardware Information\n"
-                              "• GPU Information\n"
-                              "• Process Monitoring\n"
-                              "• Process Termination (Right-click or Del key)\n"
-                              "• Real-time Updates\n"
-                              "• Modern Dark/Light Themes\n\n"
-                              "Controls:\n"
-                              "• Right-click on process: Context menu\n"
-                              "• Delete key: Terminate selected process")
-        # Reset the menu to show "Help" again
-        self.help_menu_button.set("Help")
-
-    # Switch to hardware information tab
-    def switch_to_hardware(self):
-        self.tabview.set("System Info")
-
-    # Switch to tasks information tab
-    def switch_to_tasks(self):
-        self.tabview.set("Processes")
-
-    # Display settings
-    def change_update_interval(self):
-        new_interval = simpledialog.askinteger("Change Update Interval", "Enter the new update interval (seconds):", parent=self)
-        if new_interval is not None and new_interval > 0:
-            self.update_interval = new_interval
-            self.status_label.configure(text=f"Update interval: {new_interval}s")
-            self.after(3000, lambda: self.status_label.configure(text="Ready"))
-            messagebox.showinfo("Success", f"Update interval set to {new_interval} seconds.")
-        elif new_interval is not None:
-            messagebox.showerror("Error", "Update interval must be a positive integer.")
-
-    # Manual refresh method
-    def manual_refresh(self):
-        self.status_label.configure(text="Updating...")
-        self.system_info = get_system_info()
-        # Reload GPU info on manual refresh
-        self.gpu_info = get_gpu_info()
-        
-        # Reset the display flag and show complete info
-        self.system_info_displayed = False
-        self.display_complete_system_info()
-        
-        # Clear selection before manual refresh
-        if self.process_selected:
-            self.processes_tree.selection_remove(self.processes_tree.selection())
-            self.process_selected = False
-            self.last_selected_pid = None
-        
-        self.display_processes()
-        self.status_label.configure(text="Updated")
-        self.after(2000, lambda: self.status_label.configure(text="Ready"))
-
-    # Update information in another thread
-    def update_information_threaded(self):
+    # Whether every process matching terms also matched the previous query
+    def narrows(self, terms):
+        last = self.last_terms
+        if self.last_matches is None or not last or len(terms) < len(last):
+            return False
+        if any(qualifier == "re" for qualifier, value in last):
+            return False
+        if terms[:len(last) - 1] != last[:-1]:
+            return False
+        qualifier, value = last[-1]
+        return terms[len(last) - 1][0] == qualifier and terms[len(last) - 1][1].startswith(value)
+
+    # Indices among candidates matching one term
+    def match(self, qualifier, value, candidates):
+        if qualifier == "re":
+            try:
+                pattern = re.compile(value, re.IGNORECASE)
+            except re.error as e:
+                raise ValueError(f"Invalid regular expression {value!r}: {e}")
+            search = pattern.search
+            names = self.names
+            return [index for index in candidates if search(names[index])]
+        if qualifier == "pid":
+            pids = self.pids
+            return [index for index in candidates if pids[index].startswith(value)]
+
+        needle = value.lower()
+        haystack = self.users if qualifier == "user" else self.names
+        if isinstance(candidates, range):
+            return [index for index, text in enumerate(haystack) if needle in text]
+        return [index for index in candidates if needle in haystack[index]]
+
+# Outcome of terminating one process
+class TerminationResult:
+    __slots__ = ('pid', 'name', 'status', 'error')
+
+    TERMINATED = "terminated"  # Exited after SIGTERM / TerminateProcess
+    KILLED = "killed"  # Had to be force killed
+    NOT_FOUND = "not_found"
+    ACCESS_DENIED = "access_denied"
+    CRITICAL = "critical"  # Refused, see CRITICAL_PROCESSES
+    FAILED = "failed"
+
+    def __init__(self, pid, name, status, error=None):
+        self.pid = pid
+        self.name = name
+        self.status = status
+        self.error = error
+
+    def __repr__(self):
+        return f"TerminationResult(pid={self.pid}, name={self.name!r}, status={self.status!r})"
+
+# Terminate processes on a background worker thread.
+# Each request is a set of PIDs that is terminated at once and then awaited
+# with psutil.wait_procs using one shared `timeout`, so the wall time stays
+# around one timeout however many processes there are. Survivors are force
+# killed. The callback receives the list of TerminationResults on the worker
+# thread, so GUI callers have to hand it over to the Tk main loop themselves.
+class ProcessTerminator:
+    def __init__(self, timeout=3):
+        self.timeout = timeout
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    # Queue a set of PIDs for termination
+    def submit(self, pids, callback):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="process-terminator", daemon=True)
+                self.thread.start()
+        self.queue.put((list(pids), callback))
+
+    # Let the worker finish the queued requests and exit
+    def stop(self, timeout=None):
+        with self.lock:
+            thread = self.thread
+            self.thread = None
+        if thread is not None:
+            self.queue.put(None)
+            thread.join(timeout)
+
+    # Worker loop
+    def run(self):
         while True:
+            job = self.queue.get()
+            if job is None:
+                break
+            pids, callback = job
             try:
-                # Always update system info (but less frequently)
-                self.system_info = get_system_info()
-                
-                # Update only system info part (preserve GPU info display)
-                self.after_idle(self.update_system_info_only)
-                
-                # Only update processes if none is selected
-                if not self.process_selected:
-                    self.after_idle(self.display_processes_threaded)
-                    # Update status periodically to show it's working
-                    if hasattr(self, 'status_label'):
-                        self.after_idle(lambda: self.status_label.configure(text="Auto-updated"))
-                        self.after(1000, lambda: self.status_label.configure(text="Ready") if hasattr(self, 'status_label') else None)
-                else:
-                    # Check if the selected process still exists
-                    if self.last_selected_pid:
-                        try:
-                            pid = int(self.last_selected_pid)
-                            if not psutil.pid_exists(pid):
-                                # Selected process no longer exists, resume updates
-                                self.after_idle(self.clear_selection_and_resume)
-                        except (ValueError, psutil.NoSuchProcess):
-                            self.after_idle(self.clear_selection_and_resume)
-                            
+                results = self.terminate(pids)
             except Exception as e:
-                logger.error(f"Error in update thread: {e}")
-            time.sleep(self.update_interval)
-
-    # Clear selection and resume updates
-    def clear_selection_and_resume(self):
-        try:
-            if hasattr(self, 'processes_tree'):
-                self.processes_tree.selection_remove(self.processes_tree.selection())
-            self.process_selected = False
-            self.last_selected_pid = None
-            if hasattr(self, 'status_label'):
-                self.status_label.configure(text="Selected process ended - Resuming updates")
-                self.after(2000, lambda: self.status_label.configure(text="Ready") if hasattr(self, 'status_label') else None)
-            self.after_idle(self.display_processes_threaded)
-        except Exception as e:
-            logger.error(f"Error in clear_selection_and_resume: {e}")
-
-    def display_system_info(self):
-        try:
-            if hasattr(self, 'text_display'):
-                self.text_display.configure(state="normal")  # Enable editing temporarily
-                self.text_display.delete("0.0", "end")  # Clear previous content
-                if self.system_info:
-                    self.text_display.insert("0.0", "System Information:\n")
-                    for key, value in self.system_info.items():
-                        self.text_display.insert("end", f"{key}: {value}\n")
-                        # Small yield to keep UI responsive during large updates
-                        self.update_idletasks()
-                else:
-                    self.text_display.insert("0.0", "Loading hardware information...")
-                self.text_display.configure(state="disabled")  # Disable editing again
-        except Exception as e:
-            logger.error(f"Error updating system info display: {e}")
+                logger.error(f"Failed to terminate processes {pids}: {e}")
+                results = [TerminationResult(pid, None, TerminationResult.FAILED, str(e)) for pid in pids]
+            try:
+                callback(results)
+            except Exception as e:
+                logger.error(f"Error in termination callback: {e}")
 
-    # Display complete system information (system + GPU) - called once
-    def display_complete_system_info(self):
-        try:
-            if hasattr(self, 'text_display') and not self.system_info_displayed:
-                self.text_display.configure(state="normal")  # Enable editing temporarily
-                self.text_display.delete("0.0", "end")  # Clear previous content
-                
-                # Display system information
-                if self.system_info:
-                    self.text_display.insert("0.0", "System Information:\n")
-                    for key, value in self.system_info.items():
-                        self.text_display.insert("end", f"{key}: {value}\n")
-                else:
-                    self.text_display.insert("0.0", "Loading hardware information...\n")
-                
-                # Display GPU information
-                if hasattr(self, 'gpu_info') and self.gpu_info:
-                    self.text_display.insert("end", "\nGPU Information:\n")
-                    self.text_display.insert("end", self.gpu_info)
-                else:
-                    self.text_display.insert("end", "\nGPU Information not available\n")
-                
-                self.text_display.configure(state="disabled")  # Disable editing again
-                self.system_info_displayed = True
-                self.update_idletasks()
-        except Exception as e:
-            logger.error(f"Error updating complete system info display: {e}")
+    # Terminate processes, escalating to a kill for those that do not exit in time
+    def terminate(self, pids):
+        import psutil
 
-    # Update only system information (without GPU, for threaded updates)
-    def update_system_info_only(self):
-        try:
-            if hasattr(self, 'text_display') and hasattr(self, 'system_info') and self.system_info_displayed:
-                self.text_display.configure(state="normal")  # Enable editing temporarily
-                
-                # Find and update only the system information part
-                current_content = self.text_display.get("0.0", "end")
-                
-                # Split content to preserve GPU info
-                lines = current_content.split('\n')
-                gpu_start_index = -1
-                
-                for i, line in enumerate(lines):
-                    if line.startswith("GPU Information:"):
-                        gpu_start_index = i
-                        break
-                
-                # Rebuild system info section
-                system_lines = ["System Information:"]
-                for key, value in self.system_info.items():
-                    system_lines.append(f"{key}: {value}")
-                
-                if gpu_start_index > 0:
-                    # Preserve GPU info
-                    gpu_lines = lines[gpu_start_index:]
-                    new_content = '\n'.join(system_lines + [''] + gpu_lines)
-                else:
-                    new_content = '\n'.join(system_lines)
-                
-                self.text_display.delete("0.0", "end")
-                self.text_display.insert("0.0", new_content)
-                self.text_display.configure(state="disabled")  # Disable editing again
-                self.update_idletasks()
-        except Exception as e:
-            logger.error(f"Error updating system info only: {e}")
-
-    # Display GPU information (legacy method - now unused in automatic updates)
-    def display_gpu_info(self):
-        try:
-            if hasattr(self, 'text_display') and hasattr(self, 'gpu_info'):
-                self.text_display.configure(state="normal")  # Enable editing temporarily
-                if self.gpu_info:
-                    self.text_display.insert("end", "\nGPU Information:\n")
-                    self.text_display.insert("end", self.gpu_info)
-                else:
-                    self.text_display.insert("end", "\nGPU Information not available\n")
-                self.text_display.configure(state="disabled")  # Disable editing again
-                # Small yield to keep UI responsive
-                self.update_idletasks()
-        except Exception as e:
-            logger.error(f"Error updating GPU info display: {e}")
+        results = {}
+        names = {}
+        signalled = []
 
-    # Display processes in treeview (thread-safe version)
-    def display_processes_threaded(self):
-        def load_processes():
+        # Try graceful termination of the whole set first
+        for pid in pids:
+            name = None
             try:
-                processes = []
-                # Use a smaller batch size to avoid long blocking operations
-                count = 0
-                for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-                    if proc.info['name'] != 'System Idle Process':
-                        processes.append(proc.info)
-                        count += 1
-                        # Yield control periodically during data collection
-                        if count % 50 == 0:
-                            time.sleep(0.001)  # Very short sleep to yield control
-                
-                # Sort using current sort settings
-                return processes
+                process = psutil.Process(pid)
+                name = names[pid] = process.name()
+
+                # Check if it's a critical system process
+                if name in CRITICAL_PROCESSES:
+                    results[pid] = TerminationResult(pid, name, TerminationResult.CRITICAL)
+                    continue
+
+                process.terminate()
+                signalled.append(process)
+            except psutil.NoSuchProcess:
+                results[pid] = TerminationResult(pid, name, TerminationResult.NOT_FOUND)
+            except psutil.AccessDenied:
+                results[pid] = TerminationResult(pid, name, TerminationResult.ACCESS_DENIED)
             except Exception as e:
-                logger.error(f"Error loading processes: {e}")
-                return []
-        
-        def update_ui(processes):
-            try:
-                if not self.process_selected and hasattr(self, 'processes_tree'):  # Double-check selection state and existence
-                    # Sort the processes using current sort settings
-                    processes_sorted = sorted(processes, key=self.get_sort_key, reverse=self.sort_reverse)
-                    
-                    # Remember current selection if any
-                    current_selection = self.processes_tree.selection()
-                    selected_pid = None
-                    if current_selection:
-                        try:
-                            selected_pid = self.processes_tree.item(current_selection[0])['text']
-                        except:
-                            pass  # Ignore errors if item no longer exists
-                    
-                    # Clear and repopulate in smaller chunks to keep UI responsive
-                    self.processes_tree.delete(*self.processes_tree.get_children())
-                    
-                    # Process items in smaller batches
-                    batch_size = 25
-                    for batch_start in range(0, len(processes_sorted), batch_size):
-                        batch_end = min(batch_start + batch_size, len(processes_sorted))
-                        batch = processes_sorted[batch_start:batch_end]
-                        
-                        for index, proc_info in enumerate(batch, start=batch_start):
-                            # Format CPU and memory percentages for better readability
-                            cpu_percent = f"{proc_info['cpu_percent']:.1f}%" if proc_info['cpu_percent'] else "0.0%"
-                            memory_percent = f"{proc_info['memory_percent']:.1f}%" if proc_info['memory_percent'] else "0.0%"
-                            
-                            # Alternate row colors for better readability
-                            tag = 'evenrow' if index % 2 == 0 else 'oddrow'
-                            
-                            # Insert process
-                            try:
-                                item_id = self.processes_tree.insert("", "end", text=str(proc_info['pid']), 
-                                                                   values=(proc_info['name'], cpu_percent, memory_percent),
-                                                                   tags=(tag,))
-                                
-                                # Restore selection if this was the previously selected process
-                                if selected_pid and str(proc_info['pid']) == selected_pid:
-                                    self.processes_tree.selection_set(item_id)
-                                    self.processes_tree.focus(item_id)
-                            except:
-                                pass  # Ignore individual item errors
-                        
-                        # Yield control between batches
-                        if batch_end < len(processes_sorted):
-                            self.after_idle(lambda b=batch_end: self.update_after_yield(processes_sorted, b, selected_pid))
-                            return  # Exit and continue with next batch later
-                    
-                    # Update column headers after all processes are loaded
-                    self.update_column_headers()
-                            
-            except Exception as e:
-                logger.error(f"Error updating process UI: {e}")
-        
-        # Load processes in a separate thread to avoid UI freezing
-        import threading
-        def background_load():
-            processes = load_processes()
-            # Update UI in main thread
-            self.after_idle(lambda: update_ui(processes))
-        
-        thread = threading.Thread(target=background_load, daemon=True)
-        thread.start()
-
-    # Helper method for batched updates
-    def update_after_yield(self, processes_sorted, start_index, selected_pid):
-        batch_size = 25
-        batch_end = min(start_index + batch_size, len(processes_sorted))
-        batch = processes_sorted[start_index:batch_end]
-        
-        for index, proc_info in enumerate(batch, start=start_index):
-            cpu_percent = f"{proc_info['cpu_percent']:.1f}%" if proc_info['cpu_percent'] else "0.0%"
-            memory_percent = f"{proc_info['memory_percent']:.1f}%" if proc_info['memory_percent'] else "0.0%"
-            tag = 'evenrow' if index % 2 == 0 else 'oddrow'
-            
+                results[pid] = TerminationResult(pid, name, TerminationResult.FAILED, str(e))
+
+        # Wait for all of them with one shared timeout
+        gone, alive = psutil.wait_procs(signalled, timeout=self.timeout)
+        for process in gone:
+            results[process.pid] = TerminationResult(process.pid, names[process.pid], TerminationResult.TERMINATED)
+
+        # Force kill the survivors and wait once more
+        killed = []
+        for process in alive:
             try:
-                item_id = self.processes_tree.insert("", "end", text=str(proc_info['pid']), 
-                                                   values=(proc_info['name'], cpu_percent, memory_percent),
-                                                   tags=(tag,))
-                
-                if selected_pid and str(proc_info['pid']) == selected_pid:
-                    self.processes_tree.selection_set(item_id)
-                    self.processes_tree.focus(item_id)
-            except:
-                pass
-        
-        # Continue with next batch if there are more items
-        if batch_end < len(processes_sorted):
-            self.after_idle(lambda: self.update_after_yield(processes_sorted, batch_end, selected_pid))
+                process.kill()
+                killed.append(process)
+            except psutil.NoSuchProcess:
+                results[process.pid] = TerminationResult(process.pid, names[process.pid], TerminationResult.TERMINATED)
+            except psutil.AccessDenied:
+                results[process.pid] = TerminationResult(process.pid, names[process.pid], TerminationResult.ACCESS_DENIED)
+        gone, alive = psutil.wait_procs(killed, timeout=self.timeout)
+        for process in gone:
+            results[process.pid] = TerminationResult(process.pid, names[process.pid], TerminationResult.KILLED)
+        for process in alive:
+            results[process.pid] = TerminationResult(process.pid, names[process.pid], TerminationResult.FAILED,
+                                                     "Process did not exit after being killed")
+
+        for result in results.values():
+            if result.status == TerminationResult.TERMINATED:
+                logger.info(f"Successfully terminated process: {result.name} (PID: {result.pid})")
+            elif result.status == TerminationResult.KILLED:
+                logger.info(f"Force killed process: {result.name} (PID: {result.pid})")
+        return [results[pid] for pid in pids if pid in results]
+
+# Fixed-size ring buffer of float samples backed by an array ('d' by default).
+# Memory is allocated once up front, so it never grows however long it runs.
+class RingBuffer:
+    __slots__ = ('values', 'capacity', 'start', 'count')
+
+    def __init__(self, capacity, typecode='d'):
+        self.values = array(typecode, [0]) * capacity
+        self.capacity = capacity
+        self.start = 0  # index of the oldest sample
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    # Add a sample, overwriting the oldest one when full
+    def append(self, value):
+        if self.count < self.capacity:
+            self.values[(self.start + self.count) % self.capacity] = value
+            self.count += 1
         else:
-            # Update column headers when all batches are done
-            self.update_column_headers()
-
-    # Display processes in treeview (legacy method for manual refresh)
-    def display_processes(self):
-        processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-            if proc.info['name'] != 'System Idle Process':
-                processes.append(proc.info)
-        
-        # Sort using current sort settings
-        processes_sorted = sorted(processes, key=self.get_sort_key, reverse=self.sort_reverse)
-        
-        self.processes_tree.delete(*self.processes_tree.get_children())  # Clear previous content
-        
-        for index, proc_info in enumerate(processes_sorted):
-            # Format CPU and memory percentages for better readability
-            cpu_percent = f"{proc_info['cpu_percent']:.1f}%" if proc_info['cpu_percent'] else "0.0%"
-            memory_percent = f"{proc_info['memory_percent']:.1f}%" if proc_info['memory_percent'] else "0.0%"
-            
-            # Alternate row colors for better readability
-            tag = 'evenrow' if index % 2 == 0 else 'oddrow'
-            
-            # Use PID as the text for the first column (#0) and remove it from values
-            self.processes_tree.insert("", "end", text=str(proc_info['pid']), 
-                                     values=(proc_info['name'], cpu_percent, memory_percent),
-                                     tags=(tag,))
-        
-        # Update column headers
-        self.update_column_headers()
-
-    # Clear the text display
-    def clear_text_display(self):
-        self.text_display.configure(state="normal")  # Enable editing temporarily
-        self.text_display.delete("0.0", "end")
-        self.text_display.configure(state="disabled")  # Disable editing again
-    
-    # Handle window closing event
-    def on_close(self):
-        try:
-            # Stop any ongoing operations
-            self.process_selected = False
-            # Give time for threads to finish
-            if hasattr(self, 'update_thread'):
-                self.update_thread = None
-            self.destroy()  # Close the Tkinter window
-        except Exception as e:
-            logger.error(f"Error during window closing: {e}")
-            self.destroy()
+            self.values[self.start] = value
+            self.start = (self.start + 1) % self.capacity
+
+    # Most recent sample, or None if empty
+    def latest(self):
+        if not self.count:
+            return None
+        return self.values[(self.start + self.count - 1) % self.capacity]
+
+    # Return the last n samples (all if n is None), oldest first
+    def tail(self, n=None):
+        n = self.count if n is None else min(n, self.count)
+        first = (self.start + self.count - n) % self.capacity
+        end = first + n
+        if end <= self.capacity:
+            return self.values[first:end]
+        return self.values[first:] + self.values[:end - self.capacity]
+
+# History of system metrics in two tiers: full resolution for the recent past
+# (1h at 1s by default) and averaged buckets for the long term (24h at 1min)
+class MetricHistory:
+    def __init__(self, metrics=("cpu", "ram", "disk"), resolution=1, retention=3600,
+                 downsample_resolution=60, downsample_retention=86400):
+        self.resolution = resolution
+        self.retention = retention
+        self.downsample_resolution = downsample_resolution
+        self.downsample_retention = downsample_retention
+        self.bucket_size = max(1, round(downsample_resolution / resolution))
+        self.lock = threading.Lock()
+        self.recent = {}
+        self.longterm = {}
+        self.pending = {}  # metric -> [sum, count] of the bucket being filled
+        for metric in metrics:
+            self.add_metric(metric)
+
+    # Start tracking a new metric
+    def add_metric(self, metric):
+        with self.lock:
+            if metric in self.recent:
+                return
+            self.recent[metric] = RingBuffer(max(1, int(self.retention / self.resolution)))
+            self.longterm[metric] = RingBuffer(max(1, int(self.downsample_retention / self.downsample_resolution)))
+            self.pending[metric] = [0.0, 0]
+
+    # Record one sample per metric (missing metrics are skipped)
+    def add(self, sample):
+        with self.lock:
+            for metric, value in sample.items():
+                if metric not in self.recent or value is None:
+                    continue
+                self.recent[metric].append(value)
+                bucket = self.pending[metric]
+                bucket[0] += value
+                bucket[1] += 1
+                if bucket[1] >= self.bucket_size:
+                    self.longterm[metric].append(bucket[0] / bucket[1])
+                    bucket[0] = 0.0
+                    bucket[1] = 0
+
+    # Samples covering the last `seconds` of a metric, oldest first
+    def values(self, metric, seconds=None):
+        with self.lock:
+            if metric not in self.recent:
+                return array('d')
+            if seconds is not None and seconds <= self.retention:
+                return self.recent[metric].tail(int(seconds / self.resolution))
+            count = None if seconds is None else int(seconds / self.downsample_resolution)
+            return self.longterm[metric].tail(count)
+
+    # Names of the tracked metrics
+    def metrics(self):
+        with self.lock:
+            return list(self.recent)
+
+    # Latest value of a metric, or None
+    def latest(self, metric):
+        with self.lock:
+            buffer = self.recent.get(metric)
+            return buffer.latest() if buffer else None
+
+# Compact CPU/memory history of one process
+class ProcessHistoryRecord:
+    __slots__ = ('name', 'cpu', 'memory', 'last_seen')
+
+    def __init__(self, name, samples):
+        self.name = name
+        self.cpu = RingBuffer(samples, 'f')
+        self.memory = RingBuffer(samples, 'f')
+        self.last_seen = 0.0
+
+# Per-PID history of recent samples with bounded memory.
+# Every record has a fixed size, records of exited processes expire after `ttl`
+# seconds and the number of records is capped at `max_processes`. At the cap,
+# records of exited processes make room for new PIDs, oldest first; while all
+# records belong to live processes, new PIDs get no record, so the existing
+# ones keep building history. The pinned PID (the selected process) always
+# gets a record.
+class ProcessHistoryStore:
+    def __init__(self, samples=120, max_processes=2048, ttl=60):
+        self.samples = samples
+        self.max_processes = max_processes
+        self.ttl = ttl
+        self.records = {}  # pid -> ProcessHistoryRecord
+        self.pinned = None  # PID whose record is kept even at the cap
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.records)
+
+    # Always keep a record for this PID (None to unpin)
+    def pin(self, pid):
+        self.pinned = pid
+
+    # Record one sample for every process in a process list
+    def record(self, processes, now=None):
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            records = self.records
+            new = []
+            for proc_info in processes:
+                pid = proc_info['pid']
+                record = records.get(pid)
+                if record is None:
+                    new.append(proc_info)
+                    continue
+                if record.name != proc_info['name']:
+                    # Reused PID, start over in place
+                    record = ProcessHistoryRecord(proc_info['name'], self.samples)
+                    records[pid] = record
+                self.append(record, proc_info, now)
+
+            self.evict(now)
+            if new:
+                self.add(new, now)
+
+    # Create records for new PIDs while there is room
+    def add(self, processes, now):
+        records = self.records
+        room = self.max_processes - len(records)
+        if room < len(processes):
+            room += self.evict_exited(now, len(processes) - room)
+        pinned = self.pinned
+        for proc_info in processes:
+            pid = proc_info['pid']
+            if room <= 0 and pid != pinned:
+                continue
+            if room <= 0:
+                # Make room for the selected process at the expense of the oldest record
+                oldest = min((other for other in records if other != pid),
+                             key=lambda other: records[other].last_seen, default=None)
+                if oldest is not None:
+                    del records[oldest]
+            else:
+                room -= 1
+            record = records[pid] = ProcessHistoryRecord(proc_info['name'], self.samples)
+            self.append(record, proc_info, now)
+
+    # Append one sample to a record
+    @staticmethod
+    def append(record, proc_info, now):
+        record.cpu.append(proc_info['cpu_percent'] or 0.0)
+        record.memory.append(proc_info['memory_percent'] or 0.0)
+        record.last_seen = now
+
+    # Drop records of processes that exited more than ttl seconds ago
+    def evict(self, now):
+        records = self.records
+        expired = [pid for pid, record in records.items() if now - record.last_seen > self.ttl]
+        for pid in expired:
+            del records[pid]
+
+    # Drop up to count records of exited (not seen at now) processes, oldest first; returns how many
+    def evict_exited(self, now, count):
+        records = self.records
+        exited = sorted((record.last_seen, pid) for pid, record in records.items()
+                        if record.last_seen < now and pid != self.pinned)
+        for last_seen, pid in exited[:count]:
+            del records[pid]
+        return min(count, len(exited))
+
+    # Return (name, cpu samples, memory samples) for a PID, or None
+    def get(self, pid):
+        with self.lock:
+            record = self.records.get(pid)
+            if record is None:
+                return None
+            return record.name, record.cpu.tail(), record.memory.tail()
+
+# Sample the system-wide metrics kept in the history (cheap psutil calls only)
+def sample_system_metrics():
+    import psutil
+
+    return {
+        "cpu": psutil.cpu_percent(interval=None),
+        "ram": psutil.virtual_memory().percent,
+        "disk": psutil.disk_usage('/').percent,
+    }
+
+# Whether the machine is running on battery power (False if unknown)
+def on_battery_power():
+    import psutil
+
+    try:
+        battery = psutil.sensors_battery()
+    except Exception:
+        return False
+    return battery is not None and battery.power_plugged is False
+
+# Adaptive cadence for the periodic refresh.
+# Every deadline is the previous deadline plus the current interval on the
+# monotonic clock, so the time spent refreshing does not add up to drift.
+# The configured interval is stretched while nobody is watching (unfocused,
+# on battery, or up to `max_interval` while minimized) and cut to
+# `fast_interval` for `burst_ticks` ticks after a metric moved by at least
+# `burst_threshold` percentage points. wake() ends the current wait early,
+# e.g. when the window comes back into view.
+class RefreshScheduler:
+    def __init__(self, interval=5, fast_interval=1, max_interval=60, burst_threshold=10, burst_ticks=5):
+        self.interval = interval
+        self.fast_interval = fast_interval
+        self.max_interval = max_interval
+        self.burst_threshold = burst_threshold
+        self.burst_ticks = burst_ticks
+        self.burst = 0  # remaining fast ticks
+        self.previous = {}  # metric -> value seen at the previous tick
+        self.deadline = None
+        self.wake_event = threading.Event()
+
+    # Feed the latest metric values, entering a burst when one changed fast
+    def observe(self, metrics):
+        changed_fast = False
+        for metric, value in metrics.items():
+            if value is None:
+                continue
+            previous = self.previous.get(metric)
+            if previous is not None and abs(value - previous) >= self.burst_threshold:
+                changed_fast = True
+            self.previous[metric] = value
+        if changed_fast:
+            self.burst = self.burst_ticks
+        elif self.burst:
+            self.burst -= 1
+
+    # Interval until the next tick for the given attention state
+    def next_interval(self, visible=True, focused=True, on_battery=False):
+        longest = max(self.max_interval, self.interval)
+        if not visible:
+            return longest
+        interval = min(self.interval, self.fast_interval) if self.burst else self.interval
+        if not focused:
+            interval *= 2
+        if on_battery:
+            interval *= 2
+        return min(interval, longest)
+
+    # Sleep until the next deadline; returns True if woken early
+    def wait(self, interval):
+        now = time.monotonic()
+        self.deadline = (self.deadline if self.deadline is not None else now) + interval
+        if self.deadline < now:
+            # Fell behind (slow tick, system suspend): skip the missed ticks
+            self.deadline = now + interval
+        woken = self.wake_event.wait(self.deadline - now)
+        if woken:
+            self.wake_event.clear()
+            self.deadline = time.monotonic()
+        return woken
+
+    # Run the next tick right away
+    def wake(self):
+        self.wake_event.set()
+
+# Retrieve system information that does not change while the system is running
+def get_static_system_info():
+    import psutil
+    import cpuinfo  # Slow to import and to query, only needed for the static snapshot
 
-# Retrieve system information
-def get_system_info():
     # CPU Info
     cpu_info = platform.processor()
     cpu_name = cpuinfo.get_cpu_info()['brand_raw']
@@ -1160,147 +867,892 @@ def get_system_info():
     }
     return system_info
 
-def get_gpu_info():
-    try:
-        system = platform.system()
-        gpu_list = []
+# Retrieve the fast-changing system counters (cheap psutil calls only)
+def get_dynamic_system_info():
+    import psutil
 
-        # Helper: Add GPU only if it's not a duplicate
-        def add_gpu(info):
-            if not any(info['name'] in gpu['name'] for gpu in gpu_list):
-                gpu_list.append(info)
+    ram_info = psutil.virtual_memory()
+    disk_info = psutil.disk_usage('/')
 
-        # --- NVIDIA-GPUs via nvidia-smi ---
-        def query_nvidia_smi():
-            try:
-                result = subprocess.run(
-                    ['nvidia-smi', '--query-gpu=name,memory.total,driver_version', '--format=csv,noheader,nounits'],
-                    capture_output=True, text=True, timeout=5
-                )
-                if result.returncode == 0:
-                    lines = result.stdout.strip().splitlines()
-                    for line in lines:
-                        parts = line.strip().split(',')
-                        if len(parts) >= 3:
-                            name = parts[0].strip()
-                            memory = f"{parts[1].strip()} MB"
-                            driver = parts[2].strip()
-                            add_gpu({'name': name, 'memory': memory, 'driver': driver, 'source': 'nvidia-smi'})
-            except Exception:
-                pass
-
-        # --- Windows: WMI fallback (Intel/AMD/2nd GPU) ---
-        def query_windows_wmi():
-            try:
-                powershell_cmd = """
-                Get-CimInstance Win32_VideoController | ForEach-Object {
-                    Write-Output "NAME: $($_.Name)"
-                    Write-Output "VRAM: $($_.AdapterRAM)"
-                    Write-Output "DRIVER: $($_.DriverVersion)"
-                    Write-Output "---"
-                }
-                """
-                result = subprocess.run(['powershell', '-Command', powershell_cmd],
-                                        capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    blocks = result.stdout.strip().split('---')
-                    for block in blocks:
-                        lines = block.strip().splitlines()
-                        gpu = {}
-                        for line in lines:
-                            if line.startswith("NAME:"):
-                                gpu["name"] = line.split(":", 1)[1].strip()
-                            elif line.startswith("VRAM:"):
-                                try:
-                                    vram_bytes = int(line.split(":", 1)[1].strip())
-                                    if vram_bytes > 0:
-                                        vram_gb = vram_bytes / (1024 ** 3)
-                                        gpu["memory"] = f"{vram_gb:.1f} GB" if vram_gb >= 1 else f"{vram_bytes / (1024**2):.0f} MB"
-                                except:
-                                    pass
-                            elif line.startswith("DRIVER:"):
-                                gpu["driver"] = line.split(":", 1)[1].strip()
-
-                        if gpu.get("name"):
-                            gpu['source'] = 'WMI'
-                            add_gpu(gpu)
-            except:
-                pass
-
-        # --- macOS GPU info ---
-        def query_macos():
-            try:
-                result = subprocess.run(['system_profiler', 'SPDisplaysDataType'], capture_output=True, text=True)
-                lines = result.stdout.splitlines()
-                current_gpu = {}
+    return {
+        "RAM Usage": f"{ram_info.percent:.1f}%",
+        "Storage Usage": f"{disk_info.percent:.1f}%"
+    }
 
+# Retrieve system information
+def get_system_info():
+    return {**get_static_system_info(), **get_dynamic_system_info()}
+
+# Root of the sysfs tree, can be pointed at a fixture directory
+SYSFS_ROOT = "/sys"
+
+# Locations of the PCI ID database used to name devices
+PCI_IDS_PATHS = ["/usr/share/hwdata/pci.ids", "/usr/share/misc/pci.ids", "/usr/share/pci.ids"]
+
+# Vendor names used when no PCI ID database is installed
+PCI_VENDORS = {
+    0x1002: "AMD",
+    0x10de: "NVIDIA",
+    0x8086: "Intel",
+    0x1a03: "ASPEED",
+    0x102b: "Matrox",
+    0x15ad: "VMware",
+    0x1af4: "Red Hat (virtio)",
+    0x1234: "QEMU",
+    0x1414: "Microsoft",
+}
+
+# Format a VRAM size in bytes
+def format_vram(vram_bytes):
+    vram_gb = vram_bytes / (1024 ** 3)
+    return f"{vram_gb:.1f} GB" if vram_gb >= 1 else f"{vram_bytes / (1024**2):.0f} MB"
+
+# Read a stripped sysfs attribute, or None if it does not exist or is unreadable
+def read_sysfs_value(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except (OSError, ValueError):
+        return None
+
+# Read an integer sysfs attribute ("0x10de" or "8573157376"), or None
+def read_sysfs_int(path):
+    value = read_sysfs_value(path)
+    try:
+        return int(value, 0) if value else None
+    except ValueError:
+        return None
+
+# Look up (vendor name, device name) in the PCI ID database without spawning lspci
+@functools.lru_cache(maxsize=64)
+def lookup_pci_name(vendor_id, device_id):
+    vendor_key = f"{vendor_id:04x}"
+    device_key = f"\t{device_id:04x}"
+    for path in PCI_IDS_PATHS:
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                vendor_name = None
+                for line in f:
+                    if vendor_name is None:
+                        if line.startswith(vendor_key):
+                            vendor_name = line[4:].strip()
+                    elif line.startswith(device_key):
+                        return vendor_name, line[len(device_key):].strip()
+                    elif not line.startswith("\t") and line.strip() and not line.startswith("#"):
+                        break  # Past the vendor's device list
+                return vendor_name, None
+        except OSError:
+            continue
+    return None, None
+
+# Read one GPU from its sysfs device directory
+def read_sysfs_gpu(address, device_dir):
+    vendor_id = read_sysfs_int(os.path.join(device_dir, "vendor"))
+    device_id = read_sysfs_int(os.path.join(device_dir, "device"))
+
+    gpu = {'source': 'sysfs', 'pci_address': address}
+    vendor_name = device_name = None
+    if vendor_id is not None and device_id is not None:
+        gpu['vendor_id'] = f"{vendor_id:04x}"
+        gpu['device_id'] = f"{device_id:04x}"
+        vendor_name, device_name = lookup_pci_name(vendor_id, device_id)
+        vendor_name = vendor_name or PCI_VENDORS.get(vendor_id)
+    if vendor_name:
+        gpu['vendor'] = vendor_name
+
+    if device_name:
+        gpu['name'] = device_name
+    elif 'device_id' in gpu:
+        gpu['name'] = f"{vendor_name or 'Unknown'} GPU [{gpu['vendor_id']}:{gpu['device_id']}]"
+    else:
+        gpu['name'] = f"GPU {address}"
+
+    driver_link = os.path.join(device_dir, "driver")
+    if os.path.islink(driver_link):
+        gpu['driver'] = os.path.basename(os.readlink(driver_link))
+
+    # VRAM and utilization are only exposed by some drivers (e.g. amdgpu)
+    vram_total = read_sysfs_int(os.path.join(device_dir, "mem_info_vram_total"))
+    if vram_total:
+        gpu['memory'] = format_vram(vram_total)
+        gpu['memory_total'] = vram_total
+    vram_used = read_sysfs_int(os.path.join(device_dir, "mem_info_vram_used"))
+    if vram_used is not None:
+        gpu['memory_used'] = vram_used
+    utilization = read_sysfs_int(os.path.join(device_dir, "gpu_busy_percent"))
+    if utilization is not None:
+        gpu['utilization'] = utilization
+    return gpu
+
+# Enumerate GPUs from /sys/class/drm and /sys/bus/pci/devices without spawning a process
+def read_sysfs_gpus(sysfs_root=None):
+    sysfs_root = sysfs_root or SYSFS_ROOT
+    devices = {}  # device address -> device directory
+
+    # DRM cards (card0, card1, ... but not their connectors like card0-HDMI-A-1)
+    drm_dir = os.path.join(sysfs_root, "class", "drm")
+    try:
+        cards = sorted(entry for entry in os.listdir(drm_dir) if re.fullmatch(r"card\d+", entry))
+    except OSError:
+        cards = []
+    for card in cards:
+        device_dir = os.path.realpath(os.path.join(drm_dir, card, "device"))
+        if os.path.isdir(device_dir):
+            devices.setdefault(os.path.basename(device_dir), device_dir)
+
+    # PCI display controllers (class 0x03xxxx), including those without a DRM driver
+    pci_dir = os.path.join(sysfs_root, "bus", "pci", "devices")
+    try:
+        addresses = sorted(os.listdir(pci_dir))
+    except OSError:
+        addresses = []
+    for address in addresses:
+        if address in devices:
+            continue
+        device_dir = os.path.join(pci_dir, address)
+        device_class = read_sysfs_int(os.path.join(device_dir, "class"))
+        if device_class is not None and device_class >> 16 == 0x03:
+            devices[address] = os.path.realpath(device_dir)
+
+    return [read_sysfs_gpu(address, device_dir) for address, device_dir in sorted(devices.items())]
+
+# Whether sysfs can be used to enumerate devices
+def sysfs_available(sysfs_root=None):
+    return os.path.isdir(os.path.join(sysfs_root or SYSFS_ROOT, "bus", "pci", "devices"))
+
+# Normalize a PCI address ("00000000:01:00.0" from nvidia-smi, "0000:01:00.0" from sysfs)
+def normalize_pci_address(address):
+    if not address:
+        return None
+    match = re.fullmatch(r"(?:([0-9a-fA-F]+):)?([0-9a-fA-F]{2}):([0-9a-fA-F]{2})\.([0-7])", address.strip())
+    if not match:
+        return address.strip().lower()
+    domain, bus, device, function = match.groups()
+    return f"{int(domain or '0', 16):04x}:{bus.lower()}:{device.lower()}.{function}"
+
+# One detected GPU
+class GPUInfo:
+    __slots__ = ('name', 'memory', 'driver', 'vendor', 'source', 'pci_address', 'vendor_id', 'device_id')
+
+    def __init__(self, name, memory=None, driver=None, vendor=None, source=None,
+                 pci_address=None, vendor_id=None, device_id=None):
+        self.name = name
+        self.memory = memory
+        self.driver = driver
+        self.vendor = vendor
+        self.source = source
+        self.pci_address = normalize_pci_address(pci_address)
+        self.vendor_id = vendor_id
+        self.device_id = device_id
+
+    def __eq__(self, other):
+        if not isinstance(other, GPUInfo):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __repr__(self):
+        return f"GPUInfo({self.name!r}, source={self.source!r}, pci_address={self.pci_address!r})"
+
+    # Build from a probe result dict (unknown keys are ignored)
+    @classmethod
+    def from_dict(cls, info):
+        return cls(**{field: info.get(field) for field in cls.__slots__})
+
+    # Plain dict for JSON export and the inventory cache
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__ if getattr(self, field) is not None}
+
+    # Fill in fields this record is missing from another record of the same GPU
+    def merge(self, other):
+        for field in self.__slots__:
+            if getattr(self, field) is None:
+                setattr(self, field, getattr(other, field))
+
+# Collection of detected GPUs, deduplicated by PCI address (or by name if a
+# probe does not report the address)
+class GPUList:
+    __slots__ = ('gpus', 'by_address', 'by_name')
+
+    def __init__(self, gpus=()):
+        self.gpus = []
+        self.by_address = {}
+        self.by_name = {}
+        for gpu in gpus:
+            self.add(gpu)
+
+    def __iter__(self):
+        return iter(self.gpus)
+
+    def __len__(self):
+        return len(self.gpus)
+
+    def __getitem__(self, index):
+        return self.gpus[index]
+
+    def __eq__(self, other):
+        if not isinstance(other, GPUList):
+            return NotImplemented
+        return self.gpus == other.gpus
+
+    def __repr__(self):
+        return f"GPUList({self.gpus!r})"
+
+    # Add a GPU, or merge it into the record of the same GPU found by an earlier probe
+    def add(self, gpu):
+        name_key = " ".join(gpu.name.casefold().split())
+        existing = self.by_address.get(gpu.pci_address) if gpu.pci_address else None
+        if existing is None:
+            # Unless both records have an address, the same name means the same GPU
+            same_name = self.by_name.get(name_key)
+            if same_name is not None and (gpu.pci_address is None or same_name.pci_address is None):
+                existing = same_name
+        if existing is not None:
+            existing.merge(gpu)
+            if existing.pci_address:
+                self.by_address[existing.pci_address] = existing
+            return existing
+
+        self.gpus.append(gpu)
+        if gpu.pci_address:
+            self.by_address[gpu.pci_address] = gpu
+        self.by_name.setdefault(name_key, gpu)
+        return gpu
+
+    # Plain dicts for JSON export and the inventory cache
+    def to_dicts(self):
+        return [gpu.to_dict() for gpu in self.gpus]
+
+    # Rebuild from to_dicts() output
+    @classmethod
+    def from_dicts(cls, dicts):
+        return cls(GPUInfo.from_dict(info) for info in dicts)
+
+# Render GPUs as the text shown in the hardware view
+def format_gpu_info(gpus):
+    if not gpus:
+        return "No GPUs detected."
+
+    output = ""
+    for i, gpu in enumerate(gpus, 1):
+        if len(gpus) > 1:
+            output += f"=== GPU {i} ===\n"
+        output += f"GPU: {gpu.name}\n"
+        if gpu.memory:
+            output += f"VRAM: {gpu.memory}\n"
+        if gpu.driver:
+            output += f"Driver: {gpu.driver}\n"
+        if gpu.vendor:
+            output += f"Vendor: {gpu.vendor}\n"
+        if gpu.pci_address:
+            output += f"PCI Address: {gpu.pci_address}\n"
+        output += f"Source: {gpu.source}\n\n"
+
+    return output.strip()
+
+# --- NVIDIA-GPUs via nvidia-smi ---
+def query_nvidia_smi(timeout=5):
+    import subprocess
+
+    gpus = []
+    try:
+        result = subprocess.run(
+            ['nvidia-smi', '--query-gpu=pci.bus_id,memory.total,driver_version,name', '--format=csv,noheader,nounits'],
+            capture_output=True, text=True, timeout=timeout
+        )
+        if result.returncode == 0:
+            lines = result.stdout.strip().splitlines()
+            for line in lines:
+                parts = line.strip().split(',', 3)
+                if len(parts) == 4:
+                    pci_address = parts[0].strip()
+                    memory = f"{parts[1].strip()} MB"
+                    driver = parts[2].strip()
+                    name = parts[3].strip()
+                    gpus.append({'name': name, 'memory': memory, 'driver': driver, 'source': 'nvidia-smi',
+                                 'pci_address': pci_address, 'vendor': 'NVIDIA'})
+    except Exception:
+        pass
+    return gpus
+
+# --- Windows: WMI fallback (Intel/AMD/2nd GPU) ---
+def query_windows_wmi(timeout=10):
+    import subprocess
+
+    gpus = []
+    try:
+        powershell_cmd = """
+        Get-CimInstance Win32_VideoController | ForEach-Object {
+            Write-Output "NAME: $($_.Name)"
+            Write-Output "VRAM: $($_.AdapterRAM)"
+            Write-Output "DRIVER: $($_.DriverVersion)"
+            Write-Output "---"
+        }
+        """
+        result = subprocess.run(['powershell', '-Command', powershell_cmd],
+                                capture_output=True, text=True, timeout=timeout)
+        if result.returncode == 0:
+            blocks = result.stdout.strip().split('---')
+            for block in blocks:
+                lines = block.strip().splitlines()
+                gpu = {}
                 for line in lines:
-                    line = line.strip()
-                    if line.startswith("Chipset Model:"):
-                        if current_gpu:
-                            current_gpu['source'] = 'macOS'
-                            add_gpu(current_gpu)
-                        current_gpu = {"name": line.split(":", 1)[1].strip()}
-                    elif "VRAM" in line:
-                        current_gpu["memory"] = line.split(":", 1)[1].strip()
-                    elif "Vendor:" in line:
-                        current_gpu["vendor"] = line.split(":", 1)[1].strip()
-
+                    if line.startswith("NAME:"):
+                        gpu["name"] = line.split(":", 1)[1].strip()
+                    elif line.startswith("VRAM:"):
+                        try:
+                            vram_bytes = int(line.split(":", 1)[1].strip())
+                            if vram_bytes > 0:
+                                gpu["memory"] = format_vram(vram_bytes)
+                        except:
+                            pass
+                    elif line.startswith("DRIVER:"):
+                        gpu["driver"] = line.split(":", 1)[1].strip()
+
+                if gpu.get("name"):
+                    gpu['source'] = 'WMI'
+                    gpus.append(gpu)
+    except:
+        pass
+    return gpus
+
+# --- macOS GPU info ---
+def query_macos(timeout=15):
+    import subprocess
+
+    gpus = []
+    try:
+        result = subprocess.run(['system_profiler', 'SPDisplaysDataType'],
+                                capture_output=True, text=True, timeout=timeout)
+        lines = result.stdout.splitlines()
+        current_gpu = {}
+
+        for line in lines:
+            line = line.strip()
+            if line.startswith("Chipset Model:"):
                 if current_gpu:
                     current_gpu['source'] = 'macOS'
-                    add_gpu(current_gpu)
-            except:
-                pass
+                    gpus.append(current_gpu)
+                current_gpu = {"name": line.split(":", 1)[1].strip()}
+            elif "VRAM" in line:
+                current_gpu["memory"] = line.split(":", 1)[1].strip()
+            elif "Vendor:" in line:
+                current_gpu["vendor"] = line.split(":", 1)[1].strip()
+
+        if current_gpu:
+            current_gpu['source'] = 'macOS'
+            gpus.append(current_gpu)
+    except:
+        pass
+    return gpus
+
+# --- Linux GPU via sysfs, lspci only if sysfs is not available ---
+def query_linux(timeout=5):
+    if sysfs_available():
+        return read_sysfs_gpus()
+
+    import subprocess
+
+    gpus = []
+    try:
+        result = subprocess.run(['lspci'], capture_output=True, text=True, timeout=timeout)
+        lines = result.stdout.splitlines()
+        for line in lines:
+            if any(kw in line for kw in ['VGA', '3D', 'Display']):
+                name = line.split(':')[-1].strip()
+                gpus.append({'name': name, 'source': 'lspci'})
+    except:
+        pass
+    return gpus
+
+# GPU probes per operating system as (probe, timeout in seconds), in order of
+# preference when the same GPU is reported by more than one probe
+GPU_PROBES = {
+    'Windows': [(query_nvidia_smi, 5), (query_windows_wmi, 10)],
+    'Darwin': [(query_macos, 15)],
+    'Linux': [(query_nvidia_smi, 5), (query_linux, 5)],
+}
+
+# Run GPU probes concurrently and return the GPUs they found.
+# Every probe gets its own timeout (a timed-out subprocess is killed), and the
+# whole run is bounded by the slowest probe's timeout plus a small grace
+# period, so a wedged driver cannot hang the caller. Probes run on daemon
+# threads, so one stuck in an uninterruptible wait does not hold up exit either.
+def run_gpu_probes(probes, grace=1.0):
+    results = [[] for _ in probes]
+    finished = queue.Queue()
+
+    def run_probe(index, probe, timeout):
+        try:
+            finished.put((index, probe(timeout), None))
+        except Exception as e:
+            finished.put((index, [], e))
 
-        # --- Linux GPU via lspci ---
-        def query_linux():
-            try:
-                result = subprocess.run(['lspci'], capture_output=True, text=True)
-                lines = result.stdout.splitlines()
-                for line in lines:
-                    if any(kw in line for kw in ['VGA', '3D', 'Display']):
-                        name = line.split(':')[-1].strip()
-                        add_gpu({'name': name, 'source': 'lspci'})
-            except:
-                pass
-
-        # Detect system and query
-        if system == 'Windows':
-            query_nvidia_smi()
-            query_windows_wmi()
-        elif system == 'Darwin':
-            query_macos()
-        elif system == 'Linux':
-            query_nvidia_smi()
-            query_linux()
+    for index, (probe, timeout) in enumerate(probes):
+        threading.Thread(target=run_probe, args=(index, probe, timeout),
+                         name=f"gpu-probe-{probe.__name__}", daemon=True).start()
+
+    pending = set(range(len(probes)))
+    deadline = time.monotonic() + max(timeout for _, timeout in probes) + grace
+    while pending:
+        try:
+            index, gpus, error = finished.get(timeout=max(0, deadline - time.monotonic()))
+        except queue.Empty:
+            names = [probes[index][0].__name__ for index in sorted(pending)]
+            logger.warning(f"GPU probes timed out: {', '.join(names)}")
+            break
+        pending.discard(index)
+        if error is not None:
+            logger.warning(f"GPU probe failed: {error}")
         else:
-            return "Unsupported OS."
-
-        # Format output
-        if not gpu_list:
-            return "No GPUs detected."
-
-        output = ""
-        for i, gpu in enumerate(gpu_list, 1):
-            if len(gpu_list) > 1:
-                output += f"=== GPU {i} ===\n"
-            output += f"GPU: {gpu['name']}\n"
-            if gpu.get('memory'):
-                output += f"VRAM: {gpu['memory']}\n"
-            if gpu.get('driver'):
-                output += f"Driver: {gpu['driver']}\n"
-            if gpu.get('vendor'):
-                output += f"Vendor: {gpu['vendor']}\n"
-            output += f"Source: {gpu['source']}\n\n"
-
-        return output.strip()
+            results[index] = gpus
+
+    # Merge in order of preference so the richest source wins duplicates
+    gpu_list = GPUList()
+    for gpus in results:
+        for info in gpus:
+            gpu_list.add(GPUInfo.from_dict(info))
+    return gpu_list
+
+# Live GPU utilization, temperature and memory usage.
+# NVIDIA GPUs are read through NVML when the pynvml binding is installed, or
+# from a single long-running `nvidia-smi --loop-ms` process whose CSV output is
+# parsed line by line. Otherwise GPUs exposing utilization in sysfs (amdgpu)
+# are polled. `command` (a program or an argument list) can point at a
+# stand-in for nvidia-smi.
+class GpuTelemetryStream:
+    FIELDS = ["index", "pci.bus_id", "utilization.gpu", "temperature.gpu", "memory.used", "memory.total", "name"]
+
+    def __init__(self, command=None, interval=1.0, sysfs_root=None, restart_delay=5):
+        command = command or "nvidia-smi"
+        self.command = [command] if isinstance(command, str) else list(command)
+        self.interval = interval
+        self.sysfs_root = sysfs_root
+        self.restart_delay = restart_delay  # seconds before restarting an exited nvidia-smi
+        self.source = None  # "nvml", "nvidia-smi" or "sysfs" once running
+        self.samples = {}  # GPU index -> latest sample dict
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.process = None
+        self.process_lock = threading.Lock()  # no nvidia-smi is started once stop() took it
+        self.thread = None
+
+    # Start sampling in a background thread
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="gpu-telemetry", daemon=True)
+            self.thread.start()
+
+    # Stop sampling and end the nvidia-smi process
+    def stop(self, timeout=2):
+        self.stop_event.set()
+        with self.process_lock:
+            process = self.process
+        if process and process.poll() is None:
+            process.terminate()
+        if self.thread:
+            self.thread.join(timeout)
+
+    # Latest sample of every GPU, ordered by index
+    def latest(self):
+        with self.lock:
+            return [dict(self.samples[index]) for index in sorted(self.samples)]
+
+    # Pick the best available source and sample until stopped
+    def run(self):
+        try:
+            if self.run_nvml() or self.run_nvidia_smi() or self.run_sysfs():
+                return
+            logger.info("No live GPU telemetry available")
+        except Exception as e:
+            logger.error(f"Error in GPU telemetry: {e}")
+
+    # Store one sample
+    def publish(self, sample):
+        sample['timestamp'] = time.time()
+        with self.lock:
+            self.samples[sample['index']] = sample
+
+    # Poll NVML, returns False if it is not available
+    def run_nvml(self):
+        try:
+            import pynvml
+            pynvml.nvmlInit()
+        except Exception:
+            return False
+
+        try:
+            handles = [pynvml.nvmlDeviceGetHandleByIndex(index) for index in range(pynvml.nvmlDeviceGetCount())]
+        except pynvml.NVMLError as e:
+            logger.warning(f"NVML cannot enumerate GPUs: {e}")
+            pynvml.nvmlShutdown()
+            return False
 
+        # A query a board does not support (e.g. the temperature) only blanks that field
+        def field(query, *args):
+            try:
+                return query(*args)
+            except pynvml.NVMLError:
+                return None
+
+        def text(value):
+            return value.decode() if isinstance(value, bytes) else value
+
+        self.source = "nvml"
+        try:
+            while not self.stop_event.is_set():
+                for index, handle in enumerate(handles):
+                    memory = field(pynvml.nvmlDeviceGetMemoryInfo, handle)
+                    pci_info = field(pynvml.nvmlDeviceGetPciInfo, handle)
+                    utilization = field(pynvml.nvmlDeviceGetUtilizationRates, handle)
+                    self.publish({
+                        'index': index,
+                        'pci_address': text(pci_info.busId) if pci_info else None,
+                        'name': text(field(pynvml.nvmlDeviceGetName, handle)),
+                        'utilization': utilization.gpu if utilization else None,
+                        'temperature': field(pynvml.nvmlDeviceGetTemperature, handle, pynvml.NVML_TEMPERATURE_GPU),
+                        'memory_used': memory.used // (1024 ** 2) if memory else None,
+                        'memory_total': memory.total // (1024 ** 2) if memory else None,
+                    })
+                self.stop_event.wait(self.interval)
+        finally:
+            pynvml.nvmlShutdown()
+        return True
+
+    # Stream from one long-running nvidia-smi, returns False if it cannot be started
+    def run_nvidia_smi(self):
+        import subprocess
+
+        command = [
+            *self.command,
+            f"--query-gpu={','.join(self.FIELDS)}",
+            "--format=csv,noheader,nounits",
+            f"--loop-ms={int(self.interval * 1000)}",
+        ]
+        started = False
+        while True:
+            # Checked under the lock, so stop() either sees this process or prevents it
+            with self.process_lock:
+                if self.stop_event.is_set():
+                    break
+                try:
+                    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                               text=True, bufsize=1)
+                except OSError:
+                    return started
+                self.process = process
+
+            for line in process.stdout:
+                sample = self.parse_nvidia_smi_line(line)
+                if sample:
+                    started = True
+                    self.source = "nvidia-smi"
+                    self.publish(sample)
+            process.wait()
+
+            if not started:
+                return False  # Exited without producing a single sample
+            if self.stop_event.is_set():
+                break
+            # nvidia-smi died while streaming, restart it after a short pause
+            logger.warning(f"nvidia-smi exited with code {process.returncode}, restarting")
+            self.stop_event.wait(self.restart_delay)
+        return True
+
+    # Parse one CSV line of the nvidia-smi stream
+    @staticmethod
+    def parse_nvidia_smi_line(line):
+        parts = [part.strip() for part in line.split(',', 6)]
+        if len(parts) != 7:
+            return None
+
+        def number(value):
+            try:
+                return int(float(value))
+            except ValueError:
+                return None  # "[N/A]", "[Not Supported]"
+
+        index = number(parts[0])
+        if index is None:
+            return None
+        return {
+            'index': index,
+            'pci_address': parts[1],
+            'utilization': number(parts[2]),
+            'temperature': number(parts[3]),
+            'memory_used': number(parts[4]),
+            'memory_total': number(parts[5]),
+            'name': parts[6],
+        }
+
+    # Poll sysfs for GPUs exposing utilization, returns False if there are none
+    def run_sysfs(self):
+        if not sysfs_available(self.sysfs_root):
+            return False
+
+        while not self.stop_event.is_set():
+            gpus = [gpu for gpu in read_sysfs_gpus(self.sysfs_root) if 'utilization' in gpu]
+            if not gpus:
+                return self.source == "sysfs"
+            self.source = "sysfs"
+            for index, gpu in enumerate(gpus):
+                self.publish({
+                    'index': index,
+                    'pci_address': gpu['pci_address'],
+                    'name': gpu['name'],
+                    'utilization': gpu['utilization'],
+                    'temperature': None,
+                    'memory_used': gpu['memory_used'] // (1024 ** 2) if 'memory_used' in gpu else None,
+                    'memory_total': gpu['memory_total'] // (1024 ** 2) if 'memory_total' in gpu else None,
+                })
+            self.stop_event.wait(self.interval)
+        return True
+
+# Format live GPU samples as system info fields
+def format_gpu_telemetry(samples):
+    fields = {}
+    for sample in samples:
+        prefix = f"GPU {sample['index']}"
+        if sample['utilization'] is not None:
+            fields[f"{prefix} Utilization"] = f"{sample['utilization']}%"
+        if sample['temperature'] is not None:
+            fields[f"{prefix} Temperature"] = f"{sample['temperature']} °C"
+        if sample['memory_used'] is not None:
+            if sample['memory_total']:
+                fields[f"{prefix} Memory Used"] = f"{sample['memory_used']} / {sample['memory_total']} MB"
+            else:
+                fields[f"{prefix} Memory Used"] = f"{sample['memory_used']} MB"
+    return fields
+
+# Detect GPUs, returns a GPUList
+def get_gpu_info():
+    probes = GPU_PROBES.get(platform.system())
+    if probes is None:
+        logger.info(f"GPU detection is not supported on {platform.system()}")
+        return GPUList()
+
+    try:
+        return run_gpu_probes(probes)
     except Exception as e:
-        return f"Error detecting GPU: {e}"
+        logger.error(f"Error detecting GPU: {e}")
+        return GPUList()
+
+# Directory for files that can be regenerated at any time
+def get_cache_dir():
+    system = platform.system()
+    if system == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    elif system == "Darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "PC-Info")
+
+# Identify the current boot so cached hardware facts expire on reboot
+def get_boot_id():
+    try:
+        with open("/proc/sys/kernel/random/boot_id") as f:
+            return f.read().strip()
+    except OSError:
+        # No boot ID outside of Linux, the boot time identifies the boot as well
+        import psutil
+        return str(int(psutil.boot_time()))
+
+# Persist static hardware facts (system + GPU info) on disk.
+# Entries are keyed by boot ID and kernel version, so a cached inventory is
+# only served while the machine has not been rebooted or upgraded.
+class HardwareInventoryCache:
+    VERSION = 3
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_cache_dir(), "hardware_inventory.json")
+        self.lock = threading.Lock()
+
+    # Key that a cached inventory must match to be served
+    def current_key(self):
+        return {
+            "version": self.VERSION,
+            "boot_id": get_boot_id(),
+            "kernel": platform.release(),
+        }
+
+    # Return (static_system_info, gpu_info) from disk, or None if missing or stale
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("key") != self.current_key():
+                logger.info("Cached hardware inventory is stale")
+                return None
+            return data["system_info"], GPUList.from_dicts(data["gpu_info"])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Could not read hardware inventory cache: {e}")
+            return None
 
-def main():
-    root = PCInfoApp()
+    # Write an inventory to disk atomically
+    def save(self, static_system_info, gpu_info):
+        data = {"key": self.current_key(), "system_info": static_system_info, "gpu_info": gpu_info.to_dicts()}
+        try:
+            with self.lock:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2)
+                os.replace(temp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not write hardware inventory cache: {e}")
+
+    # Rediscover the hardware and update the cache (slow, call off the UI thread)
+    def refresh(self):
+        static_system_info = get_static_system_info()
+        gpu_info = get_gpu_info()
+        self.save(static_system_info, gpu_info)
+        return static_system_info, gpu_info
+
+# Read-only view of the machine at one point in time: system information,
+# GPU records (None until discovered), the process list (None if not sampled)
+# and the wall-clock timestamp. The containers are frozen, so a snapshot can
+# be handed to any thread and rendered without copying or locking.
+class Snapshot:
+    __slots__ = ('system', 'gpu', 'processes', 'timestamp')
+
+    def __init__(self, system=None, gpu=None, processes=None, timestamp=None):
+        object.__setattr__(self, 'system', MappingProxyType(dict(system or {})))
+        object.__setattr__(self, 'gpu', gpu)
+        object.__setattr__(self, 'processes', tuple(processes) if processes is not None else None)
+        object.__setattr__(self, 'timestamp', time.time() if timestamp is None else timestamp)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Snapshot is immutable")
+
+    # New snapshot with some parts replaced, sharing the unchanged ones
+    def replace(self, **changes):
+        snapshot = object.__new__(Snapshot)
+        for name in Snapshot.__slots__:
+            object.__setattr__(snapshot, name, getattr(self, name))
+        if 'system' in changes:
+            object.__setattr__(snapshot, 'system', MappingProxyType(dict(changes['system'] or {})))
+        if 'gpu' in changes:
+            object.__setattr__(snapshot, 'gpu', changes['gpu'])
+        if 'processes' in changes:
+            processes = changes['processes']
+            object.__setattr__(snapshot, 'processes', tuple(processes) if processes is not None else None)
+        object.__setattr__(snapshot, 'timestamp', changes.get('timestamp', time.time()))
+        return snapshot
+
+    # Plain data for export
+    def to_dict(self):
+        data = {
+            "timestamp": datetime.datetime.fromtimestamp(self.timestamp, datetime.timezone.utc).isoformat(),
+            "system": dict(self.system),
+            "gpu": self.gpu.to_dicts() if self.gpu is not None else [],
+        }
+        if self.processes is not None:
+            data["processes"] = list(self.processes)
+        return data
+
+# Holds the latest Snapshot. Producers derive the next snapshot from the
+# current one and swap it in under a lock, so concurrent producers never lose
+# each other's parts; readers just take `current` and keep a consistent view
+# for as long as they hold on to it.
+class SnapshotStore:
+    def __init__(self, snapshot=None):
+        self.current = snapshot if snapshot is not None else Snapshot()
+        self.lock = threading.Lock()
+
+    # Publish a snapshot with some parts replaced and return it
+    def update(self, **changes):
+        with self.lock:
+            snapshot = self.current.replace(**changes)
+            self.current = snapshot
+        return snapshot
+
+# Shared sampler so CPU deltas survive between refreshes
+process_sampler = ProcessSampler()
+
+# Shared on-disk hardware inventory
+hardware_inventory = HardwareInventoryCache()
+
+# Collect system, GPU and process information without any GUI
+def collect_report(include_processes=True, sample_interval=0.5):
+    # Static facts come from the inventory cache when it is still valid
+    inventory = hardware_inventory.load() or hardware_inventory.refresh()
+    static_system_info, gpu_info = inventory
+
+    processes = None
+    if include_processes:
+        # CPU % is a delta, so it needs two samples some time apart
+        process_sampler.sample()
+        if sample_interval > 0:
+            time.sleep(sample_interval)
+        processes = process_sampler.sample()
+
+    snapshot = Snapshot({**static_system_info, **get_dynamic_system_info()}, gpu_info, processes)
+    data = snapshot.to_dict()
+    return {"timestamp": data.pop("timestamp"), "hostname": platform.node(), **data}
+
+# Write a report as a single JSON document
+def write_json(report, stream):
+    json.dump(report, stream, indent=2)
+    stream.write("\n")
+
+# Write a report as NDJSON: one host record followed by one record per process
+def write_ndjson(report, stream):
+    host = {key: value for key, value in report.items() if key != "processes"}
+    stream.write(json.dumps({"type": "host", **host}) + "\n")
+    for proc_info in report.get("processes", []):
+        record = {"type": "process", "timestamp": report["timestamp"], "hostname": report["hostname"], **proc_info}
+        stream.write(json.dumps(record) + "\n")
+
+# Run the headless export and return the process exit code
+def run_headless(args):
+    try:
+        report = collect_report(include_processes=not args.no_processes, sample_interval=args.interval)
+    except Exception as e:
+        logger.error(f"Error collecting system information: {e}")
+        return 1
+
+    writer = write_ndjson if args.format == "ndjson" else write_json
+    try:
+        if args.output == "-":
+            writer(report, sys.stdout)
+        else:
+            with open(args.output, "w", encoding="utf-8") as f:
+                writer(report, f)
+    except OSError as e:
+        logger.error(f"Error writing {args.output}: {e}")
+        return 1
+    return 0
+
+# Parse command line arguments
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="pc_info", description="Display system information and manage processes.")
+    parser.add_argument("--headless", action="store_true",
+                        help="print the information instead of opening the window")
+    parser.add_argument("--format", choices=["json", "ndjson"], default="json",
+                        help="output format for --headless (default: json)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="file to write to for --headless (default: stdout)")
+    parser.add_argument("--no-processes", action="store_true",
+                        help="leave the process table out of the --headless output")
+    parser.add_argument("--interval", type=float, default=0.5,
+                        help="seconds between the two process CPU samples for --headless (default: 0.5)")
+    parser.add_argument("--offline", action="store_true",
+                        help="never check the internet connection")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logging(headless=args.headless)
+    if args.headless:
+        return run_headless(args)
+
+    # The GUI (and tkinter) is only imported when a window is actually needed
+    from pc_informations.gui import PCInfoApp
+    root = PCInfoApp(network_check=not args.offline)
     root.mainloop()
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,2171 @@
+import os
+import time
+import queue
+import functools
+import psutil
+import bisect
+import socket
+import platform
+import threading
+import tkinter as tk
+import customtkinter as ctk
+from tkinter import messagebox, simpledialog
+from tkinter import ttk 
+from collections import deque
+from pc_informations.pc_info import (
+    logger,
+    setup_logging,
+    process_sampler,
+    hardware_inventory,
+    get_dynamic_system_info,
+    sample_system_metrics,
+    MetricHistory,
+    ProcessHistoryStore,
+    GpuTelemetryStream,
+    format_gpu_telemetry,
+    format_gpu_info,
+    ProcessTree,
+    ProcessIndex,
+    TOP_PROCESSES,
+    ProcessTerminator,
+    TerminationResult,
+    RefreshScheduler,
+    on_battery_power,
+    SnapshotStore,
+    find_matching_processes,
+)
+
+# Set the appearance mode and color theme
+ctk.set_appearance_mode("dark")  # Modes: "System" (standard), "Dark", "Light"
+ctk.set_default_color_theme("blue")  # Themes: "blue" (standard), "green", "dark-blue"
+
+class PCInfoApp(ctk.CTk):
+    def __init__(self, network_check=True):
+        setup_logging()
+        super().__init__()
+        self.title("PC Info")
+        self.resizable(width=False, height=False)
+        self.geometry("800x600")  # Set a fixed window size
+        self.protocol("WM_DELETE_WINDOW", self.on_close)  # Handle window closing event
+
+        # Worker threads never touch Tk: they hand their newest state (or
+        # events) to the dispatcher and exit once the stop event is set
+        self.stop_event = threading.Event()
+        self.ui_dispatcher = UIDispatcher(self.stop_event)
+        self.frame_budget = FrameBudget()
+        self.status_reset_id = None
+        self.ui_idle_frames = 0
+        self.ui_poll_id = self.after(UI_FRAME_INTERVAL, self.process_ui_queue)
+        self.workers = []
+        
+        # Set application icon
+        self.set_app_icon()
+        
+        # For Windows, set icon again after window is fully loaded
+        if platform.system() == "Windows":
+            self.after(500, self.ensure_windows_icon)
+
+        # Create menu bar frame
+        self.menu_bar = ctk.CTkFrame(self, height=40)
+        self.menu_bar.pack(fill="x", padx=0, pady=0)
+        self.menu_bar.pack_propagate(False)
+
+        # File Menu
+        self.file_menu_button = ctk.CTkOptionMenu(
+            self.menu_bar, 
+            values=["Exit"],
+            command=self.file_menu_callback,
+            width=60,
+            height=30
+        )
+        self.file_menu_button.pack(side="left", padx=5, pady=5)
+        self.file_menu_button.set("File")
+
+        # View Menu
+        self.view_menu_button = ctk.CTkOptionMenu(
+            self.menu_bar,
+            values=["System Info", "Processes", "Refresh Now", "End Selected Process", "End Matching Processes..."],
+            command=self.view_menu_callback,
+            width=60,
+            height=30
+        )
+        self.view_menu_button.pack(side="left", padx=5, pady=5)
+        self.view_menu_button.set("View")
+
+        # Settings Menu
+        self.settings_menu_button = ctk.CTkOptionMenu(
+            self.menu_bar,
+            values=["Change Update Interval", "Theme: Dark", "Theme: Light", "Theme: System",
+                    "Process Table: Top 50", "Process Table: Auto", "Process Table: Full",
+                    "Process Table: Virtualized", "Process Table: Tree"],
+            command=self.settings_menu_callback,
+            width=80,
+            height=30
+        )
+        self.settings_menu_button.pack(side="left", padx=5, pady=5)
+        self.settings_menu_button.set("Settings")
+
+        # Help Menu
+        self.help_menu_button = ctk.CTkOptionMenu(
+            self.menu_bar,
+            values=["About"],
+            command=self.help_menu_callback,
+            width=60,
+            height=30
+        )
+        self.help_menu_button.pack(side="left", padx=5, pady=5)
+        self.help_menu_button.set("Help")
+
+        # Status label on the right side
+        self.status_label = ctk.CTkLabel(self.menu_bar, text="Ready")
+        self.status_label.pack(side="right", padx=10, pady=5)
+
+        # Connectivity indicator, filled in by a background check
+        self.connection_label = ctk.CTkLabel(self.menu_bar, text="", text_color="gray")
+        self.connection_label.pack(side="right", padx=5, pady=5)
+
+        # Create tabview for organizing content
+        self.tabview = ctk.CTkTabview(self, width=780, height=500, command=self.on_tab_changed)
+        self.tabview.pack(fill="both", expand=True, padx=10, pady=5)
+        
+        # Add tabs
+        self.tabview.add("System Info")
+        self.tabview.add("Processes")
+
+        # Track who is looking at the window, so refreshes only sample what is
+        # visible and back off while nobody watches
+        self.active_tab = self.tabview.get()
+        self.window_visible = True
+        self.window_focused = True
+        self.bind("<Map>", self.on_window_mapped, add="+")
+        self.bind("<Unmap>", self.on_window_mapped, add="+")
+        self.bind("<FocusIn>", self.on_focus_changed, add="+")
+        self.bind("<FocusOut>", self.on_focus_changed, add="+")
+        
+        # Create frame for system info content
+        self.info_frame = ctk.CTkFrame(self.tabview.tab("System Info"))
+        self.info_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        # Create sparkline charts for the CPU, RAM and disk history
+        self.history_frame = ctk.CTkFrame(self.info_frame, fg_color="transparent")
+        self.history_frame.pack(fill="x", padx=10, pady=(10, 0))
+        
+        self.history_range_button = ctk.CTkSegmentedButton(
+            self.history_frame,
+            values=list(HISTORY_RANGES),
+            command=lambda choice: self.refresh_sparklines(reschedule=False)
+        )
+        self.history_range_button.set("5 min")
+        self.history_range_button.pack(anchor="e", pady=(0, 5))
+        
+        self.sparklines = {}
+        for metric, title in (("cpu", "CPU"), ("ram", "RAM"), ("disk", "Disk")):
+            sparkline = Sparkline(self.history_frame, title)
+            sparkline.pack(fill="x", pady=1)
+            self.sparklines[metric] = sparkline
+        
+        # Create text widget for system information (read-only)
+        self.text_display = ctk.CTkTextbox(self.info_frame, state="disabled")
+        self.text_display.pack(fill="both", expand=True, padx=10, pady=(10, 5))
+        self.hardware_panel = HardwarePanel(self.text_display)
+        
+        # Create copy button
+        self.copy_button = ctk.CTkButton(
+            self.info_frame,
+            text="Copy System Info to Clipboard",
+            command=self.copy_system_info,
+            height=30
+        )
+        self.copy_button.pack(pady=(0, 10))
+
+        # Create frame for treeview in processes tab
+        self.tree_frame = ctk.CTkFrame(self.tabview.tab("Processes"))
+        self.tree_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Filter box over the process table
+        self.process_filter_frame = ctk.CTkFrame(self.tree_frame, fg_color="transparent")
+        self.process_filter_frame.pack(side="top", fill="x", padx=5, pady=(5, 0))
+        self.process_filter_entry = ctk.CTkEntry(
+            self.process_filter_frame,
+            placeholder_text="Filter processes (name, re:PATTERN, user:NAME, pid:PID)"
+        )
+        self.process_filter_entry.pack(side="left", fill="x", expand=True)
+        self.process_filter_label = ctk.CTkLabel(self.process_filter_frame, text="", width=120, anchor="e")
+        self.process_filter_label.pack(side="right", padx=(5, 0))
+        self.process_filter_entry.bind('<KeyRelease>', self.on_process_filter_changed)
+        self.process_filter_entry.bind('<Escape>', self.clear_process_filter)
+        self.process_filter_border = self.process_filter_entry.cget("border_color")
+        self.process_filter = ""
+        self.process_filter_valid = True
+
+        # Create treeview to display processes
+        self.processes_tree = ttk.Treeview(self.tree_frame, columns=("name", "cpu_percent", "memory_percent"))
+        self.processes_tree.heading("#0", text="PID")
+        self.processes_tree.heading("name", text="Process Name")
+        self.processes_tree.heading("cpu_percent", text="CPU Usage %")
+        self.processes_tree.heading("memory_percent", text="Memory %")
+        
+        # Improved column widths for better readability
+        self.processes_tree.column("#0", width=80, minwidth=60)
+        self.processes_tree.column("name", width=300, minwidth=200)
+        self.processes_tree.column("cpu_percent", width=120, minwidth=100)
+        self.processes_tree.column("memory_percent", width=120, minwidth=100)
+        
+        # Mini-graph with the recent history of the selected process
+        self.process_history = ProcessHistoryStore()
+        self.process_history_frame = ctk.CTkFrame(self.tree_frame, fg_color="transparent")
+        self.process_history_frame.pack(side="bottom", fill="x", padx=5, pady=(0, 5))
+        self.process_history_label = ctk.CTkLabel(self.process_history_frame, text="", anchor="w")
+        self.process_history_label.pack(fill="x")
+        self.process_sparklines = {
+            "cpu": Sparkline(self.process_history_frame, "CPU", maximum=None),
+            "memory": Sparkline(self.process_history_frame, "Memory"),
+        }
+        for sparkline in self.process_sparklines.values():
+            sparkline.pack(fill="x", pady=1)
+        
+        # Style the treeview for dark theme
+        self.setup_treeview_style()
+        
+        # Add context menu for process management
+        self.setup_process_context_menu()
+        
+        # Bind keyboard events for process management
+        self.processes_tree.bind('<Delete>', self.kill_selected_process_key)
+        self.processes_tree.bind('<Button-3>', self.show_context_menu)  # Right click
+        self.processes_tree.bind('<<TreeviewSelect>>', self.on_process_select)  # Selection changed
+        self.processes_tree.bind('<Button-1>', self.on_process_click)  # Left click
+        
+        # Bind column header clicks for sorting
+        self.processes_tree.heading("#0", command=lambda: self.sort_processes("pid"))
+        self.processes_tree.heading("name", command=lambda: self.sort_processes("name"))
+        self.processes_tree.heading("cpu_percent", command=lambda: self.sort_processes("cpu_percent"))
+        self.processes_tree.heading("memory_percent", command=lambda: self.sort_processes("memory_percent"))
+        
+        self.processes_scrollbar = ttk.Scrollbar(self.tree_frame, orient="vertical")
+        self.processes_scrollbar.pack(side="right", fill="y", pady=5)
+        self.processes_tree.pack(fill="both", expand=True, padx=5, pady=5)
+
+        # Keep rows in sync by PID instead of rebuilding the tree every refresh,
+        # or only keep the visible rows in the widget when there are very many
+        self.process_reconciler = ProcessTreeReconciler(self.processes_tree, self.processes_scrollbar)
+        self.virtual_table = VirtualProcessTable(self.processes_tree, self.processes_scrollbar)
+        self.process_tree_view = ProcessTreeView(self.processes_tree, self.processes_scrollbar)
+        self.table_mode = "Top 50"
+        self.process_view = self.process_reconciler
+        self.process_view.activate()
+
+        # Initialize the refresh cadence (5 seconds, adapted to what is visible)
+        self.refresh_scheduler = RefreshScheduler(interval=5)
+
+        # Initialize update interval button
+        self.update_interval_button = None
+        
+        # Terminate processes off the UI thread
+        self.process_terminator = ProcessTerminator()
+
+        # Track selection state to pause updates
+        self.process_selected = False
+        self.last_selected_pid = None
+        
+        # Track sorting state
+        self.sort_column = "cpu_percent"  # Default sort column
+        self.sort_reverse = True  # Default to descending (highest CPU first)
+
+        # The sampler thread filters and sorts with these, then wakes on requests
+        self.update_process_view_options()
+        self.process_requests = threading.Event()
+        self.process_request_lock = threading.Lock()
+        self.process_resample = False
+        self.process_render_forced = False
+
+        # Stream live GPU utilization, temperature and memory usage
+        self.gpu_telemetry = GpuTelemetryStream()
+        self.gpu_telemetry.start()
+
+        # Every view renders from the latest published snapshot
+        self.snapshots = SnapshotStore()
+
+        # Serve hardware information from the on-disk inventory if it is still valid
+        cached_inventory = hardware_inventory.load()
+        if cached_inventory:
+            self.static_system_info, gpu_info = cached_inventory
+            self.snapshots.update(system=self.collect_system_info(), gpu=gpu_info)
+        else:
+            self.static_system_info = {}
+        
+        # Flag to track if system info display is initialized
+        self.system_info_displayed = False
+        self.hardware_loading = True
+
+        self.display_complete_system_info()  # Display all system info once
+        self.request_process_view(force=True)  # Display processes when opening
+
+        # Discover (or revalidate) hardware information without blocking the UI
+        self.start_hardware_revalidation()
+
+        # Keep a bounded per-second history of system metrics for the sparklines
+        self.metric_history = MetricHistory()
+
+        # One long-lived thread samples and sorts processes whenever a refresh asks for it
+        self.start_worker("process-sampler", self.process_sampling_loop)
+
+        # Start the update thread
+        self.update_thread = self.start_worker("update", self.update_information_threaded)
+
+        self.history_thread = self.start_worker("metric-history", self.record_metric_history)
+        self.after(1000, self.refresh_sparklines)
+
+        # Connectivity is only ever checked off the startup path
+        self.connection_check_interval = 30
+        if network_check:
+            self.connection_thread = self.start_worker("connection-check", self.monitor_internet_connection)
+
+    # Start a background worker that on_close waits for
+    def start_worker(self, name, target):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        self.workers = [worker for worker in self.workers if worker.is_alive()]
+        self.workers.append(thread)
+        thread.start()
+        return thread
+
+    # Apply the newest worker state once per frame (Tk main thread).
+    # Queued events left over once the frame budget is spent run in the next frame.
+    # Polling slows down while the window is hidden or nothing has arrived for a while.
+    def process_ui_queue(self):
+        budget = self.frame_budget
+        budget.start()
+        if self.ui_dispatcher.flush(budget):
+            budget.finish()
+            self.ui_idle_frames = 0
+        else:
+            self.ui_idle_frames += 1
+
+        if self.ui_dispatcher.busy():
+            delay = 1
+        elif not self.window_visible:
+            delay = UI_HIDDEN_INTERVAL
+        elif self.ui_idle_frames >= UI_IDLE_FRAMES:
+            delay = UI_IDLE_INTERVAL
+        else:
+            delay = UI_FRAME_INTERVAL
+        self.ui_poll_id = self.after(delay, self.process_ui_queue)
+
+    # Go back to polling every frame, e.g. when the user is waiting for a result
+    def wake_ui_queue(self):
+        self.ui_idle_frames = 0
+        if self.ui_poll_id is not None:
+            self.after_cancel(self.ui_poll_id)
+        self.ui_poll_id = self.after(UI_FRAME_INTERVAL, self.process_ui_queue)
+
+    # Show a status message, going back to "Ready" after reset_after ms.
+    # A newer message cancels the pending reset of the previous one.
+    def set_status(self, text, reset_after=None):
+        if self.status_reset_id is not None:
+            self.after_cancel(self.status_reset_id)
+            self.status_reset_id = None
+        self.status_label.configure(text=text)
+        if reset_after is not None:
+            self.status_reset_id = self.after(reset_after, self.reset_status)
+
+    # Go back to the idle status
+    def reset_status(self):
+        self.status_reset_id = None
+        self.status_label.configure(text="Ready")
+
+    # Set application icon for all platforms
+    def set_app_icon(self):
+        try:
+            # Get the directory where the script is located
+            script_dir = os.path.dirname(os.path.abspath(__file__))
+            icon_path = os.path.join(script_dir, "icon.png")
+            
+            # Check if icon file exists
+            if os.path.exists(icon_path):
+                icon_set = False
+                
+                # Windows-specific icon handling
+                if platform.system() == "Windows":
+                    # First try to convert and use ICO format
+                    ico_path = icon_path.replace('.png', '.ico')
+                    
+                    # Create ICO file if it doesn't exist
+                    if not os.path.exists(ico_path):
+                        if self.create_ico_from_png(icon_path, ico_path):
+                            logger.info(f"Created ICO file: {ico_path}")
+                    
+                    # Try to use ICO file
+                    if os.path.exists(ico_path):
+                        try:
+                            self.iconbitmap(ico_path)
+                            icon_set = True
+                            logger.info(f"Windows icon set using ICO: {ico_path}")
+                        except Exception as e:
+                            logger.warning(f"Could not set ICO icon: {e}")
+                    
+                    # If ICO failed, try PNG with PhotoImage
+                    if not icon_set:
+                        try:
+                            import tkinter as tk
+                            # Wait for window to be fully initialized
+                            self.update()
+                            photo = tk.PhotoImage(file=icon_path)
+                            self.iconphoto(True, photo)
+                            # Keep reference to prevent garbage collection
+                            self.icon_photo = photo
+                            icon_set = True
+                            logger.info(f"Windows icon set using PhotoImage: {icon_path}")
+                        except Exception as e:
+                            logger.warning(f"Could not set PhotoImage icon: {e}")
+                
+                else:
+                    # Non-Windows systems (macOS, Linux)
+                    try:
+                        import tkinter as tk
+                        photo = tk.PhotoImage(file=icon_path)
+                        self.iconphoto(True, photo)
+                        self.icon_photo = photo
+                        icon_set = True
+                        logger.info(f"Icon set using PhotoImage: {icon_path}")
+                    except Exception as e:
+                        logger.warning(f"Could not set PhotoImage icon: {e}")
+                
+                if not icon_set:
+                    self.set_fallback_icon()
+                else:
+                    # Set additional Windows taskbar properties
+                    if platform.system() == "Windows":
+                        self.set_windows_properties()
+                    
+            else:
+                logger.warning(f"Icon file not found: {icon_path}")
+                self.set_fallback_icon()
+                
+        except Exception as e:
+            logger.error(f"Error setting application icon: {e}")
+            self.set_fallback_icon()
+
+    # Create ICO file from PNG
+    def create_ico_from_png(self, png_path, ico_path):
+        try:
+            from PIL import Image
+            
+            with Image.open(png_path) as img:
+                # Convert to RGBA if not already
+                if img.mode != 'RGBA':
+                    img = img.convert('RGBA')
+                
+                # Create multiple sizes for better Windows compatibility
+                icon_sizes = [(16, 16), (32, 32), (48, 48), (64, 64), (128, 128), (256, 256)]
+                
+                # Resize and save as ICO
+                img.save(ico_path, format='ICO', sizes=icon_sizes)
+                return True
+                
+        except ImportError:
+            logger.warning("PIL (Pillow) not available - cannot convert PNG to ICO")
+            return False
+        except Exception as e:
+            logger.warning(f"Could not create ICO from PNG: {e}")
+            return False
+
+    # Set Windows-specific properties
+    def set_windows_properties(self):
+        try:
+            if platform.system() == "Windows":
+                # Set application user model ID for proper taskbar grouping
+                import ctypes
+                try:
+                    ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID("PCInfo.SystemMonitor.1.0")
+                    logger.info("Windows App User Model ID set")
+                except Exception as e:
+                    logger.warning(f"Could not set App User Model ID: {e}")
+                    
+                # Try to set window icon using Windows API as fallback
+                try:
+                    script_dir = os.path.dirname(os.path.abspath(__file__))
+                    ico_path = os.path.join(script_dir, "icon.ico")
+                    
+                    if os.path.exists(ico_path):
+                        # Get window handle after window is shown
+                        self.after(100, lambda: self.set_window_icon_winapi(ico_path))
+                except Exception as e:
+                    logger.warning(f"Could not prepare Windows API icon: {e}")
+                    
+        except Exception as e:
+            logger.warning(f"Could not set Windows properties: {e}")
+
+    # Set window icon using Windows API
+    def set_window_icon_winapi(self, ico_path):
+        try:
+            import ctypes
+            from ctypes import wintypes
+            
+            # Get window handle
+            hwnd = self.winfo_id()
+            
+            # Load icon
+            user32 = ctypes.windll.user32
+            kernel32 = ctypes.windll.kernel32
+            
+            # Constants
+            IMAGE_ICON = 1
+            LR_LOADFROMFILE = 0x00000010
+            LR_DEFAULTSIZE = 0x00000040
+            
+            WM_SETICON = 0x0080
+            ICON_SMALL = 0
+            ICON_BIG = 1
+            
+            # Load icon from file
+            hicon_small = user32.LoadImageW(
+                None,
+                ico_path,
+                IMAGE_ICON,
+                16, 16,
+                LR_LOADFROMFILE | LR_DEFAULTSIZE
+            )
+            
+            hicon_large = user32.LoadImageW(
+                None,
+                ico_path,
+                IMAGE_ICON,
+                32, 32,
+                LR_LOADFROMFILE | LR_DEFAULTSIZE
+            )
+            
+            if hicon_small:
+                user32.SendMessageW(hwnd, WM_SETICON, ICON_SMALL, hicon_small)
+                logger.info("Small window icon set via Windows API")
+                
+            if hicon_large:
+                user32.SendMessageW(hwnd, WM_SETICON, ICON_BIG, hicon_large)
+                logger.info("Large window icon set via Windows API")
+                
+        except Exception as e:
+            logger.warning(f"Could not set icon via Windows API: {e}")
+
+    # Ensure Windows icon is properly set after window initialization
+    def ensure_windows_icon(self):
+        try:
+            if platform.system() == "Windows":
+                script_dir = os.path.dirname(os.path.abspath(__file__))
+                icon_path = os.path.join(script_dir, "icon.png")
+                ico_path = os.path.join(script_dir, "icon.ico")
+                
+                # Try ICO first if available
+                if os.path.exists(ico_path):
+                    try:
+                        self.iconbitmap(ico_path)
+                        logger.info("Windows icon re-applied using ICO")
+                    except Exception as e:
+                        logger.warning(f"Could not re-apply ICO icon: {e}")
+                        # Try PNG fallback
+                        if os.path.exists(icon_path):
+                            try:
+                                import tkinter as tk
+                                photo = tk.PhotoImage(file=icon_path)
+                                self.iconphoto(True, photo)
+                                self.icon_photo = photo
+                                logger.info("Windows icon re-applied using PhotoImage")
+                            except Exception as e2:
+                                logger.warning(f"Could not re-apply PhotoImage icon: {e2}")
+                
+                # Set Windows API icon as additional measure
+                if os.path.exists(ico_path):
+                    self.set_window_icon_winapi(ico_path)
+                    
+        except Exception as e:
+            logger.warning(f"Error in ensure_windows_icon: {e}")
+
+    # Alternative method to set icon using base64 encoded data (fallback)
+    def set_fallback_icon(self):
+        try:
+            # For Windows, try a different approach with emoji
+            if platform.system() == "Windows":
+                self.title("PC Info 🖥️")  # Add computer emoji to title
+                # Try to set a basic system icon
+                try:
+                    import tkinter as tk
+                    # Create a simple colored square as fallback icon
+                    fallback_icon = tk.PhotoImage(width=32, height=32)
+                    fallback_icon.put("#1f538d", to=(0, 0, 32, 32))  # Blue square
+                    self.iconphoto(True, fallback_icon)
+                    self.fallback_icon_ref = fallback_icon  # Keep reference
+                    logger.info("Using fallback colored icon")
+                except Exception:
+                    logger.info("Using emoji in title as final fallback")
+            else:
+                # For other systems
+                self.title("PC Info 🖥️")
+                logger.info("Using emoji in title as icon fallback")
+            
+        except Exception as e:
+            logger.warning(f"Could not set fallback icon: {e}")
+            # Last resort - just change title
+            try:
+                self.title("PC Info")
+            except:
+                pass
+
+    # Check internet connection
+    def check_internet_connection(self):
+        try:
+            with socket.create_connection(("www.google.com", 80), timeout=3):
+                return True
+        except OSError:
+            return False
+
+    # Check connectivity periodically in the background and show it as an indicator
+    def monitor_internet_connection(self):
+        while not self.stop_event.is_set():
+            online = self.check_internet_connection()
+            if not self.ui_dispatcher.publish("connection", lambda: self.show_connection_status(online)):
+                break  # Window has been closed
+            self.stop_event.wait(self.connection_check_interval)
+
+    # Update the connectivity indicator
+    def show_connection_status(self, online):
+        if online:
+            self.connection_label.configure(text="● Online", text_color="#2fa84f")
+        else:
+            self.connection_label.configure(text="● Offline", text_color="gray")
+
+    # Setup treeview style for better theme integration
+    def setup_treeview_style(self):
+        style = ttk.Style()
+        
+        # Configure colors based on current appearance mode
+        current_mode = ctk.get_appearance_mode()
+        
+        if current_mode == "Dark":
+            # Dark theme colors
+            bg_color = "#212121"
+            fg_color = "#ffffff"
+            select_bg = "#1f538d"
+            select_fg = "#ffffff"
+            field_bg = "#2b2b2b"
+            heading_bg = "#2b2b2b"
+        else:
+            # Light theme colors
+            bg_color = "#ffffff"
+            fg_color = "#000000"
+            select_bg = "#0078d4"
+            select_fg = "#ffffff"
+            field_bg = "#f0f0f0"
+            heading_bg = "#e1e1e1"
+        
+        # Configure treeview style with better readability
+        style.theme_use('clam')
+        style.configure("Treeview",
+                       background=bg_color,
+                       foreground=fg_color,
+                       fieldbackground=field_bg,
+                       borderwidth=1,
+                       relief="solid",
+                       font=('Segoe UI', 10, 'normal'),  # Larger, clearer font
+                       rowheight=25)  # Increased row height for better readability
+        
+        # Configure alternating row colors for better readability
+        if current_mode == "Dark":
+            alternate_color = "#2d2d2d"
+        else:
+            alternate_color = "#f8f8f8"
+            
+        self.processes_tree.tag_configure('oddrow', background=field_bg)
+        self.processes_tree.tag_configure('evenrow', background=alternate_color)
+        
+        # Use the same palette for the history charts
+        self.chart_background = field_bg
+        for sparkline in (*self.sparklines.values(), *self.process_sparklines.values()):
+            sparkline.canvas.configure(bg=field_bg)
+        
+        style.configure("Treeview.Heading",
+                       background=heading_bg,
+                       foreground=fg_color,
+                       borderwidth=1,
+                       relief="solid",
+                       font=('Segoe UI', 11, 'bold'))  # Bold headers with larger font
+        
+        style.map("Treeview",
+                 background=[('selected', select_bg)],
+                 foreground=[('selected', select_fg)])
+        
+        style.map("Treeview.Heading",
+                 background=[('active', heading_bg)],
+                 foreground=[('active', fg_color)])
+
+    # Setup context menu for process management
+    def setup_process_context_menu(self):
+        import tkinter as tk
+        self.context_menu = tk.Menu(self, tearoff=0)
+        self.context_menu.add_command(label="End Process", command=self.kill_selected_process)
+        self.context_menu.add_command(label="End Matching Processes...", command=self.kill_matching_processes)
+        self.context_menu.add_separator()
+        self.context_menu.add_command(label="Refresh Process List", command=self.manual_refresh)
+
+    # Show context menu on right click
+    def show_context_menu(self, event):
+        # Select the item under the cursor
+        item = self.processes_tree.identify_row(event.y)
+        if item:
+            # Keep a multi-selection when right-clicking one of its rows
+            if item not in self.processes_tree.selection():
+                self.processes_tree.selection_set(item)
+            self.processes_tree.focus(item)
+            # Show context menu
+            try:
+                self.context_menu.tk_popup(event.x_root, event.y_root)
+            finally:
+                self.context_menu.grab_release()
+
+    # Handle process selection
+    def on_process_select(self, event):
+        selected_pids = self.process_view.selected_pids()
+        if selected_pids:
+            self.process_selected = True
+            # Get PID of selected process
+            self.last_selected_pid = str(selected_pids[0])
+            self.process_history.pin(selected_pids[0])
+            self.set_status("Process selected - Updates paused")
+        else:
+            self.process_selected = False
+            self.last_selected_pid = None
+            self.process_history.pin(None)
+            self.set_status("Ready")
+        self.refresh_process_history()
+
+    # Show the recent history of the selected process in the mini-graph
+    def refresh_process_history(self):
+        try:
+            history = None
+            if self.last_selected_pid:
+                history = self.process_history.get(int(self.last_selected_pid))
+
+            if history is None:
+                self.process_history_label.configure(text="Select a process to see its recent CPU and memory history")
+                for sparkline in self.process_sparklines.values():
+                    sparkline.draw([], self.process_history.samples)
+                return
+
+            name, cpu, memory = history
+            self.process_history_label.configure(
+                text=f"{name} (PID {self.last_selected_pid}) - peak CPU {max(cpu):.1f}%, peak memory {max(memory):.1f}%"
+            )
+            self.process_sparklines["cpu"].draw(cpu, self.process_history.samples)
+            self.process_sparklines["memory"].draw(memory, self.process_history.samples)
+        except Exception as e:
+            logger.error(f"Error drawing process history: {e}")
+
+    # Sample all processes, record them in the per-process history and publish
+    # them; returns the new snapshot
+    def sample_processes(self):
+        processes = process_sampler.sample()
+        self.process_history.record(processes)
+        return self.snapshots.update(processes=processes)
+
+    # Handle left click to potentially deselect
+    def on_process_click(self, event):
+        # Check if click is on empty area
+        item = self.processes_tree.identify_row(event.y)
+        if not item:
+            # Clicked on empty area, clear selection
+            self.processes_tree.selection_remove(self.processes_tree.selection())
+            self.process_selected = False
+            self.last_selected_pid = None
+            self.set_status("Ready")
+
+    # Sort processes by column
+    def sort_processes(self, column):
+        # Toggle sort direction if clicking the same column
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            # Set default sort direction for each column
+            if column == "pid":
+                self.sort_reverse = False  # PID ascending by default
+            elif column == "name":
+                self.sort_reverse = False  # Name ascending by default
+            elif column in ["cpu_percent", "memory_percent"]:
+                self.sort_reverse = True  # CPU/Memory descending by default
+        
+        # Update column headers to show sort direction
+        self.update_column_headers()
+        
+        # Re-sort the current snapshot off the UI thread, even while a process is selected
+        self.update_process_view_options()
+        self.request_process_view(resample=False, force=True)
+
+    # Update column headers to show sort indicators
+    def update_column_headers(self):
+        # Reset all headers
+        self.processes_tree.heading("#0", text="PID")
+        self.processes_tree.heading("name", text="Process Name")
+        self.processes_tree.heading("cpu_percent", text="CPU Usage %")
+        self.processes_tree.heading("memory_percent", text="Memory %")
+        
+        # Add sort indicator to current sort column
+        sort_indicator = " ↓" if self.sort_reverse else " ↑"
+        
+        if self.sort_column == "pid":
+            self.processes_tree.heading("#0", text=f"PID{sort_indicator}")
+        elif self.sort_column == "name":
+            self.processes_tree.heading("name", text=f"Process Name{sort_indicator}")
+        elif self.sort_column == "cpu_percent":
+            self.processes_tree.heading("cpu_percent", text=f"CPU Usage %{sort_indicator}")
+        elif self.sort_column == "memory_percent":
+            self.processes_tree.heading("memory_percent", text=f"Memory %{sort_indicator}")
+
+    # Kill selected process via keyboard shortcut (Delete key)
+    def kill_selected_process_key(self, event):
+        self.kill_selected_process()
+
+    # Kill the selected processes
+    def kill_selected_process(self):
+        selected_pids = self.process_view.selected_pids()
+        if not selected_pids:
+            messagebox.showwarning("No Selection", "Please select a process to terminate.")
+            return
+
+        if len(selected_pids) == 1:
+            pid = selected_pids[0]
+            process_name = self.process_view.name_of(pid)
+
+            # Confirm before killing the process
+            result = messagebox.askyesno(
+                "Confirm Process Termination",
+                f"Are you sure you want to terminate the process?\n\n"
+                f"Process: {process_name}\n"
+                f"PID: {pid}\n\n"
+                f"Warning: Terminating system processes may cause instability!"
+            )
+            if result:
+                self.terminate_processes(selected_pids, f"Terminating {process_name}...")
+            return
+
+        processes = [(pid, self.process_view.name_of(pid)) for pid in selected_pids]
+        if self.confirm_batch_termination(processes):
+            self.terminate_processes(selected_pids, f"Terminating {len(selected_pids)} processes...")
+
+    # Kill all processes matching a name, regular expression, user or cgroup
+    def kill_matching_processes(self):
+        query = simpledialog.askstring(
+            "End Matching Processes",
+            "Terminate all processes matching:\n\n"
+            "  NAME or name:NAME    exact process name\n"
+            "  re:PATTERN               regular expression on the name\n"
+            "  user:USER                  processes of a user\n"
+            "  cgroup:PATH             control group (Linux)\n\n"
+            "Combine terms with spaces, e.g. \"re:^python user:alice\"",
+            parent=self
+        )
+        if not query or not query.strip():
+            return
+
+        self.set_status("Searching processes...")
+
+        # Walking the process table can take a moment, so do it off the UI thread
+        def search():
+            try:
+                matches = find_matching_processes(query)
+                error = None
+            except Exception as e:
+                matches, error = [], e
+            self.ui_dispatcher.post(lambda: confirm(matches, error))
+
+        def confirm(matches, error):
+            self.set_status("Ready")
+            if error is not None:
+                messagebox.showerror("Invalid Pattern", str(error))
+            elif not matches:
+                messagebox.showinfo("No Matches", f"No processes match \"{query}\".")
+            elif self.confirm_batch_termination(matches):
+                self.terminate_processes([pid for pid, name in matches], f"Terminating {len(matches)} processes...")
+
+        self.start_worker("process-search", search)
+
+    # Ask once before terminating several processes
+    def confirm_batch_termination(self, processes):
+        shown = "\n".join(f"{name} (PID {pid})" for pid, name in processes[:10])
+        if len(processes) > 10:
+            shown += f"\n... and {len(processes) - 10} more"
+        return messagebox.askyesno(
+            "Confirm Process Termination",
+            f"Are you sure you want to terminate {len(processes)} processes?\n\n"
+            f"{shown}\n\n"
+            f"Warning: Terminating system processes may cause instability!"
+        )
+
+    # Terminate (and if needed kill) on the worker thread, the UI keeps running
+    def terminate_processes(self, pids, status):
+        self.set_status(status)
+        self.process_terminator.submit(
+            pids, lambda results: self.ui_dispatcher.post(lambda: self.on_processes_terminated(results))
+        )
+
+    # Handle the outcome of a termination request (runs on the Tk main thread)
+    def on_processes_terminated(self, results):
+        # Remove just the rows of the ended processes
+        ended = [result.pid for result in results
+                 if result.status in (TerminationResult.TERMINATED, TerminationResult.KILLED, TerminationResult.NOT_FOUND)]
+        if ended:
+            self.process_view.remove(ended)
+            # Pick up the remaining selection, resuming updates if nothing is left
+            self.on_process_select(None)
+
+        if len(results) == 1:
+            self.report_termination(results[0])
+            return
+
+        terminated = sum(1 for result in results if result.status == TerminationResult.TERMINATED)
+        killed = sum(1 for result in results if result.status == TerminationResult.KILLED)
+        failed = [result for result in results if result.status not in
+                  (TerminationResult.TERMINATED, TerminationResult.KILLED, TerminationResult.NOT_FOUND)]
+        status = f"{terminated + killed} processes terminated"
+        if killed:
+            status += f" ({killed} force killed)"
+        self.set_status(status, reset_after=3000)
+
+        if failed:
+            reasons = {
+                TerminationResult.CRITICAL: "critical system process",
+                TerminationResult.ACCESS_DENIED: "access denied",
+            }
+            lines = [f"{result.name or self.process_view.name_of(result.pid)} (PID {result.pid}): "
+                     f"{reasons.get(result.status, result.error)}" for result in failed[:10]]
+            if len(failed) > 10:
+                lines.append(f"... and {len(failed) - 10} more")
+            messagebox.showwarning(
+                "Some Processes Were Not Terminated",
+                f"{len(failed)} of {len(results)} processes could not be terminated:\n\n" + "\n".join(lines)
+            )
+
+    # Report the outcome of terminating a single process
+    def report_termination(self, result):
+        process_name = result.name or self.process_view.name_of(result.pid)
+
+        if result.status == TerminationResult.TERMINATED:
+            self.set_status(f"Process {process_name} terminated", reset_after=3000)
+        elif result.status == TerminationResult.KILLED:
+            self.set_status(f"Process {process_name} force killed", reset_after=3000)
+        else:
+            self.set_status("Ready")
+            if result.status == TerminationResult.NOT_FOUND:
+                messagebox.showinfo("Process Not Found", f"Process with PID {result.pid} no longer exists.")
+            elif result.status == TerminationResult.CRITICAL:
+                messagebox.showerror(
+                    "Cannot Terminate Process",
+                    f"Cannot terminate critical system process: {process_name}\n"
+                    f"This could cause system instability or crash."
+                )
+            elif result.status == TerminationResult.ACCESS_DENIED:
+                messagebox.showerror(
+                    "Access Denied", 
+                    f"Access denied. Cannot terminate process: {process_name}\n"
+                    f"You may need administrator privileges to terminate this process."
+                )
+            else:
+                messagebox.showerror("Error", f"Failed to terminate process: {result.error}")
+
+    # Copy system information to clipboard
+    def copy_system_info(self):
+        try:
+            # Get all text content
+            content = self.text_display.get("0.0", "end-1c")
+            
+            # Copy to clipboard
+            self.clipboard_clear()
+            self.clipboard_append(content)
+            
+            # Show confirmation
+            self.set_status("System info copied to clipboard", reset_after=3000)
+            
+            logger.info("System information copied to clipboard")
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to copy to clipboard: {str(e)}")
+            logger.error(f"Error copying to clipboard: {e}")
+
+    # Menu callback functions
+    def file_menu_callback(self, choice):
+        if choice == "Exit":
+            self.on_close()  # Stops the workers before the window is destroyed
+            return
+        # Reset the menu to show "File" again
+        self.file_menu_button.set("File")
+
+    def view_menu_callback(self, choice):
+        if choice == "System Info":
+            self.show_tab("System Info")
+        elif choice == "Processes":
+            self.show_tab("Processes")
+        elif choice == "Refresh Now":
+            self.manual_refresh()
+            self.set_status("Refreshed", reset_after=2000)
+        elif choice == "End Selected Process":
+            self.show_tab("Processes")  # Switch to processes tab first
+            self.kill_selected_process()
+        elif choice == "End Matching Processes...":
+            self.show_tab("Processes")
+            self.kill_matching_processes()
+        # Reset the menu to show "View" again
+        self.view_menu_button.set("View")
+
+    def settings_menu_callback(self, choice):
+        if choice == "Change Update Interval":
+            self.change_update_interval()
+        elif choice == "Theme: Dark":
+            ctk.set_appearance_mode("dark")
+            self.setup_treeview_style()  # Update treeview style
+            self.set_status("Theme changed to Dark", reset_after=2000)
+        elif choice == "Theme: Light":
+            ctk.set_appearance_mode("light")
+            self.setup_treeview_style()  # Update treeview style
+            self.set_status("Theme changed to Light", reset_after=2000)
+        elif choice == "Theme: System":
+            ctk.set_appearance_mode("system")
+            self.setup_treeview_style()  # Update treeview style
+            self.set_status("Theme changed to System", reset_after=2000)
+        elif choice.startswith("Process Table: "):
+            self.table_mode = choice[len("Process Table: "):]
+            self.update_process_view_options()
+            self.request_process_view(resample=False, force=True)
+            self.set_status(f"Process table: {self.table_mode}", reset_after=2000)
+        # Reset the menu to show "Settings" again
+        self.settings_menu_button.set("Settings")
+
+    def help_menu_callback(self, choice):
+        if choice == "About":
+            messagebox.showinfo("About PC Info", 
+                              "PC Info v2.1\n"
+                              "A system information tool\n"
+                              "Built with CustomTkinter\n\n"
+                              "Features:\n"
+                              "• System Hardware Information\n"
+                              "• GPU Information\n"
+                              "• Process Monitoring\n"
+                              "• Process Tree with per-subtree CPU/Memory totals\n"
+                              "• Process Termination (Right-click or Del key)\n"
+                              "• End several or all matching processes at once\n"
+                              "• Real-time Updates\n"
+                              "• Modern Dark/Light Themes\n\n"
+                              "Controls:\n"
+                              "• Right-click on process: Context menu\n"
+                              "• Filter box: name, re:PATTERN, user:NAME, pid:PID (Esc clears)\n"
+                              "• Ctrl/Shift-click: Select several processes\n"
+                              "• Delete key: Terminate selected processes")
+        # Reset the menu to show "Help" again
+        self.help_menu_button.set("Help")
+
+    # Switch to hardware information tab
+    def switch_to_hardware(self):
+        self.show_tab("System Info")
+
+    # Switch to tasks information tab
+    def switch_to_tasks(self):
+        self.show_tab("Processes")
+
+    # Switch tabs from code (CTkTabview only calls its command for clicks)
+    def show_tab(self, name):
+        self.tabview.set(name)
+        self.on_tab_changed()
+
+    # Refresh the newly shown tab right away
+    def on_tab_changed(self):
+        tab = self.tabview.get()
+        if tab != self.active_tab:
+            self.active_tab = tab
+            self.refresh_scheduler.wake()
+            self.wake_ui_queue()
+
+    # Track minimizing and restoring the main window
+    def on_window_mapped(self, event):
+        if event.widget is not self:
+            return
+        visible = event.type == tk.EventType.Map
+        if visible != self.window_visible:
+            self.window_visible = visible
+            if visible:
+                self.refresh_scheduler.wake()
+                self.wake_ui_queue()
+
+    # Track whether the application has the keyboard focus. Focus events also
+    # arrive when the focus moves between widgets, so check once they settle.
+    def on_focus_changed(self, event):
+        self.after_idle(self.update_window_focus)
+
+    # Read the focus state once the focus events have been processed
+    def update_window_focus(self):
+        try:
+            focused = self.focus_displayof() is not None
+        except (KeyError, tk.TclError):
+            focused = False  # the focus is on a transient Tk widget such as a menu
+        if focused != self.window_focused:
+            self.window_focused = focused
+            if focused:
+                self.refresh_scheduler.wake()
+
+    # Display settings
+    def change_update_interval(self):
+        new_interval = simpledialog.askinteger("Change Update Interval", "Enter the new update interval (seconds):", parent=self)
+        if new_interval is not None and new_interval > 0:
+            self.refresh_scheduler.interval = new_interval
+            self.refresh_scheduler.wake()
+            self.set_status(f"Update interval: {new_interval}s", reset_after=3000)
+            messagebox.showinfo("Success", f"Update interval set to {new_interval} seconds.")
+        elif new_interval is not None:
+            messagebox.showerror("Error", "Update interval must be a positive integer.")
+
+    # Manual refresh method
+    def manual_refresh(self):
+        self.set_status("Updating...")
+        # Reload hardware and GPU info in the background on manual refresh
+        self.start_hardware_revalidation()
+        
+        # Clear selection before manual refresh
+        if self.process_selected:
+            self.processes_tree.selection_remove(self.processes_tree.selection())
+            self.process_selected = False
+            self.last_selected_pid = None
+        
+        self.request_process_view(force=True)
+        self.set_status("Updated", reset_after=2000)
+
+    # Rediscover hardware information in a background thread
+    def start_hardware_revalidation(self):
+        def revalidate():
+            try:
+                static_system_info, gpu_info = hardware_inventory.refresh()
+                changed = static_system_info != self.static_system_info or gpu_info != self.snapshots.current.gpu
+                self.static_system_info = static_system_info
+                snapshot = self.snapshots.update(system=self.collect_system_info(), gpu=gpu_info)
+                self.ui_dispatcher.publish("hardware", lambda: self.apply_hardware_inventory(snapshot, changed))
+            except Exception as e:
+                logger.error(f"Error discovering hardware information: {e}")
+                # Stop showing the loading placeholders, whatever is known stays visible
+                self.ui_dispatcher.publish(
+                    "hardware", lambda: self.apply_hardware_inventory(self.snapshots.current, True)
+                )
+
+        self.start_worker("hardware-inventory", revalidate)
+
+    # Show freshly discovered hardware information if it differs from what is displayed
+    def apply_hardware_inventory(self, snapshot, changed):
+        self.hardware_loading = False
+        if changed:
+            self.system_info_displayed = False
+            self.display_complete_system_info(snapshot)
+
+    # Combine the static snapshot with freshly sampled dynamic values and GPU telemetry
+    def collect_system_info(self):
+        return {
+            **self.static_system_info,
+            **get_dynamic_system_info(),
+            **format_gpu_telemetry(self.gpu_telemetry.latest()),
+        }
+
+    # Sample system metrics into the history at a fixed, drift-free cadence
+    def record_metric_history(self):
+        next_sample = time.monotonic()
+        while not self.stop_event.is_set():
+            try:
+                sample = sample_system_metrics()
+                for gpu in self.gpu_telemetry.latest():
+                    metric = f"gpu{gpu['index']}"
+                    self.metric_history.add_metric(metric)
+                    sample[metric] = gpu['utilization']
+                self.metric_history.add(sample)
+            except Exception as e:
+                logger.error(f"Error sampling metric history: {e}")
+            next_sample += self.metric_history.resolution
+            self.stop_event.wait(max(0, next_sample - time.monotonic()))
+
+    # Redraw the sparklines from the metric history
+    def refresh_sparklines(self, reschedule=True):
+        try:
+            if self.window_visible and self.active_tab == "System Info":
+                seconds = HISTORY_RANGES[self.history_range_button.get()]
+                if seconds <= self.metric_history.retention:
+                    capacity = int(seconds / self.metric_history.resolution)
+                else:
+                    capacity = int(seconds / self.metric_history.downsample_resolution)
+                # Add a chart for every GPU that reports live utilization
+                for metric in self.metric_history.metrics():
+                    if metric not in self.sparklines and metric.startswith("gpu"):
+                        sparkline = Sparkline(self.history_frame, f"GPU {metric[3:]}")
+                        sparkline.canvas.configure(bg=self.chart_background)
+                        sparkline.pack(fill="x", pady=1)
+                        self.sparklines[metric] = sparkline
+                for metric, sparkline in self.sparklines.items():
+                    sparkline.draw(self.metric_history.values(metric, seconds), capacity)
+        except Exception as e:
+            logger.error(f"Error drawing sparklines: {e}")
+        if reschedule:
+            self.after(1000, self.refresh_sparklines)
+
+    # Update information in another thread.
+    # Only the panel on screen is sampled, and the cadence adapts to whether
+    # anyone is watching and to how fast the metrics are moving.
+    def update_information_threaded(self):
+        while not self.stop_event.is_set():
+            visible = self.window_visible
+            try:
+                if visible and self.active_tab == "System Info":
+                    # Only sample the values that can change, the static part is reused
+                    snapshot = self.snapshots.update(system=self.collect_system_info())
+                    
+                    # Lay out the text here, the UI thread only applies the changes
+                    prepared = HardwarePanel.prepare(self.hardware_sections(snapshot))
+                    self.ui_dispatcher.publish(
+                        "system_info", lambda: self.update_system_info_only(prepared, snapshot.timestamp)
+                    )
+                
+                if visible and self.active_tab == "Processes":
+                    # Only update processes if none is selected
+                    if not self.process_selected:
+                        self.request_process_view()
+                        # Update status periodically to show it's working
+                        self.ui_dispatcher.publish("status", self.show_auto_updated)
+                    else:
+                        # Keep recording history while the table is paused
+                        self.sample_processes()
+                        self.ui_dispatcher.publish("process_history", self.refresh_process_history)
+
+                        # Check if the selected process still exists
+                        if self.last_selected_pid:
+                            try:
+                                pid = int(self.last_selected_pid)
+                                if not psutil.pid_exists(pid):
+                                    # Selected process no longer exists, resume updates
+                                    self.ui_dispatcher.publish("selection", self.clear_selection_and_resume)
+                            except (ValueError, psutil.NoSuchProcess):
+                                self.ui_dispatcher.publish("selection", self.clear_selection_and_resume)
+
+                # The history thread samples these every second anyway
+                self.refresh_scheduler.observe({
+                    "cpu": self.metric_history.latest("cpu"),
+                    "ram": self.metric_history.latest("ram"),
+                })
+                            
+            except Exception as e:
+                logger.error(f"Error in update thread: {e}")
+            interval = self.refresh_scheduler.next_interval(visible, self.window_focused, on_battery_power())
+            self.refresh_scheduler.wait(interval)
+
+    # Flash the status label after an automatic refresh
+    def show_auto_updated(self):
+        self.set_status("Auto-updated", reset_after=1000)
+
+    # Clear selection and resume updates
+    def clear_selection_and_resume(self):
+        try:
+            if hasattr(self, 'processes_tree'):
+                self.processes_tree.selection_remove(self.processes_tree.selection())
+            self.process_selected = False
+            self.last_selected_pid = None
+            if hasattr(self, 'status_label'):
+                self.set_status("Selected process ended - Resuming updates", reset_after=2000)
+            self.request_process_view()
+        except Exception as e:
+            logger.error(f"Error in clear_selection_and_resume: {e}")
+
+    # Display complete system information (system + GPU) - called once
+    def display_complete_system_info(self, snapshot=None):
+        try:
+            if hasattr(self, 'hardware_panel') and not self.system_info_displayed:
+                if snapshot is None:
+                    snapshot = self.snapshots.current
+                self.hardware_panel.show(self.hardware_sections(snapshot), snapshot.timestamp)
+                self.system_info_displayed = True
+        except Exception as e:
+            logger.error(f"Error updating complete system info display: {e}")
+
+    # Sections of the hardware view: system fields, then the GPU text
+    def hardware_sections(self, snapshot=None):
+        if snapshot is None:
+            snapshot = self.snapshots.current
+        if snapshot.system:
+            sections = ["System Information:\n", snapshot.system]
+        elif self.hardware_loading:
+            sections = ["Loading hardware information...\n"]
+        else:
+            sections = ["System Information not available\n"]
+        sections.append("\n" + self.format_gpu_section(snapshot))
+        return sections
+
+    # Render the GPU section of the hardware view from the GPU records
+    def format_gpu_section(self, snapshot):
+        if snapshot.gpu is not None:
+            return "GPU Information:\n" + format_gpu_info(snapshot.gpu)
+        elif self.hardware_loading:
+            return "GPU Information:\nDetecting GPUs...\n"
+        return "GPU Information not available\n"
+
+    # Update only the system values that changed (for threaded updates)
+    def update_system_info_only(self, prepared=None, timestamp=None):
+        try:
+            if hasattr(self, 'hardware_panel') and self.system_info_displayed:
+                if prepared is None:
+                    snapshot = self.snapshots.current
+                    prepared, timestamp = HardwarePanel.prepare(self.hardware_sections(snapshot)), snapshot.timestamp
+                self.hardware_panel.commit(prepared, timestamp)
+        except Exception as e:
+            logger.error(f"Error updating system info only: {e}")
+
+    # Remember the sort, filter and row limit for the sampler thread (one atomic assignment)
+    def update_process_view_options(self):
+        limit = TOP_PROCESSES if self.table_mode == "Top 50" else None
+        self.process_view_options = (self.sort_column, self.sort_reverse, limit, self.process_filter)
+
+    # Ask the sampler thread for a new table view; a pending request already covers this one.
+    # Without resample the current snapshot is only filtered and sorted again. A forced
+    # view is shown even while a process is selected; only user actions on the Tk main
+    # thread force one, so they also wake the UI queue for a prompt result.
+    def request_process_view(self, resample=True, force=False):
+        with self.process_request_lock:
+            self.process_resample = self.process_resample or resample
+            self.process_render_forced = self.process_render_forced or force
+        self.process_requests.set()
+        if force:
+            self.wake_ui_queue()
+
+    # Sample, filter and sort processes whenever asked, until the window closes
+    def process_sampling_loop(self):
+        index = ProcessIndex(())
+        query = ""  # Last valid filter query
+        while True:
+            self.process_requests.wait()
+            if self.stop_event.is_set():
+                break
+            self.process_requests.clear()
+            with self.process_request_lock:
+                resample, force = self.process_resample, self.process_render_forced
+                self.process_resample = self.process_render_forced = False
+            try:
+                snapshot = self.snapshots.current
+                if resample or snapshot.processes is None:
+                    snapshot = self.sample_processes()
+                # Prepare names and sort keys once per snapshot
+                if index.processes is not snapshot.processes:
+                    index = ProcessIndex(snapshot.processes)
+
+                column, reverse, limit, requested = self.process_view_options
+                try:
+                    rows, matched = index.view(requested, column, reverse, limit)
+                    query, valid = requested, True
+                except ValueError:
+                    # Keep showing the last valid result while the pattern is incomplete
+                    rows, matched = index.view(query, column, reverse, limit)
+                    valid = False
+            except Exception as e:
+                logger.error(f"Error loading processes: {e}")
+                continue
+            # Update UI in main thread
+            self.ui_dispatcher.publish("processes", functools.partial(
+                self.apply_process_view, rows, matched, len(snapshot.processes), valid, force
+            ))
+
+    # Show a sorted process view from the sampler thread
+    def apply_process_view(self, processes_sorted, matched, total, valid, force):
+        try:
+            if valid != self.process_filter_valid:
+                self.process_filter_valid = valid
+                self.process_filter_entry.configure(border_color=self.process_filter_border if valid else "red")
+            if force or not self.process_selected:  # Double-check selection state
+                # Apply only the differences to the existing rows
+                self.render_processes(processes_sorted, matched, total)
+                
+                # Update column headers after all processes are loaded
+                self.update_column_headers()
+                self.refresh_process_history()
+                        
+        except Exception as e:
+            logger.error(f"Error updating process UI: {e}")
+
+    # Apply the filter box as the user types
+    def on_process_filter_changed(self, event):
+        query = self.process_filter_entry.get()
+        if query == self.process_filter:
+            return
+        self.process_filter = query
+        self.update_process_view_options()
+        self.request_process_view(resample=False, force=True)
+
+    # Clear the filter box (Escape)
+    def clear_process_filter(self, event=None):
+        self.process_filter_entry.delete(0, "end")
+        self.on_process_filter_changed(event)
+
+    # Render a sorted view with the table mode that fits the row count
+    def render_processes(self, processes_sorted, matched, total):
+        if self.process_filter:
+            self.process_filter_label.configure(text=f"{matched} of {total}")
+        elif len(processes_sorted) < total:
+            self.process_filter_label.configure(text=f"Top {len(processes_sorted)} of {total}")
+        else:
+            self.process_filter_label.configure(text=f"{total} processes")
+
+        if self.table_mode == "Tree":
+            view = self.process_tree_view
+            view.sort_column = self.sort_column
+            view.sort_reverse = self.sort_reverse
+        elif self.table_mode == "Auto":
+            virtual = len(processes_sorted) > VIRTUAL_TABLE_THRESHOLD
+            view = self.virtual_table if virtual else self.process_reconciler
+        else:
+            virtual = self.table_mode == "Virtualized"
+            view = self.virtual_table if virtual else self.process_reconciler
+
+        if view is not self.process_view:
+            self.process_view.deactivate()
+            view.activate()
+            self.process_view = view
+        view.reconcile(processes_sorted)
+
+    # Handle window closing event
+    def on_close(self):
+        try:
+            # Tell every worker to stop and wake the ones that are waiting
+            self.stop_event.set()
+            self.refresh_scheduler.wake()
+            self.process_requests.set()
+            self.gpu_telemetry.stop()
+            self.process_terminator.stop(timeout=0)
+
+            # Give the workers a short, shared grace period; a blocking probe
+            # (network check, hardware discovery) is left behind as a daemon thread
+            deadline = time.monotonic() + 1.0
+            for thread in self.workers:
+                thread.join(max(0, deadline - time.monotonic()))
+                if thread.is_alive():
+                    logger.info(f"Worker {thread.name} still busy at shutdown")
+
+            self.after_cancel(self.ui_poll_id)
+            logger.info(f"UI frame statistics: {self.frame_budget.summary()}, "
+                        f"superseded updates dropped: {self.ui_dispatcher.superseded}")
+            self.destroy()  # Close the Tkinter window
+        except Exception as e:
+            logger.error(f"Error during window closing: {e}")
+            self.destroy()
+
+# Keep the process Treeview in sync with the latest process list by PID.
+# Only changed cells are rewritten, new PIDs inserted, exited PIDs deleted and
+# rows moved when the sort order actually changes, so the number of Tk calls
+# per refresh follows process churn instead of the total process count.
+class ProcessTreeReconciler:
+    def __init__(self, tree, scrollbar):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.items = {}  # pid -> Treeview item id
+        self.rows = {}  # pid -> (values, tag) last written to the tree
+        self.order = []  # item ids in current display order
+
+    # Format a process info dict into Treeview column values
+    @staticmethod
+    def format_values(proc_info):
+        cpu_percent = f"{proc_info['cpu_percent']:.1f}%" if proc_info['cpu_percent'] else "0.0%"
+        memory_percent = f"{proc_info['memory_percent']:.1f}%" if proc_info['memory_percent'] else "0.0%"
+        return (proc_info['name'], cpu_percent, memory_percent)
+
+    # Let the Treeview scroll itself
+    def activate(self):
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.configure(command=self.tree.yview)
+
+    # Give the Treeview back in an empty state
+    def deactivate(self):
+        self.clear()
+
+    # PIDs of the selected processes
+    def selected_pids(self):
+        return [int(self.tree.item(item_id, 'text')) for item_id in self.tree.selection()]
+
+    # Displayed name of a process, or None
+    def name_of(self, pid):
+        row = self.rows.get(pid)
+        return row[0][0] if row else None
+
+    # Bring the tree in line with the sorted process list
+    def reconcile(self, processes_sorted):
+        tree = self.tree
+        selection = tree.selection()
+        desired = []
+        inserted = []
+        seen = set()
+
+        for index, proc_info in enumerate(processes_sorted):
+            pid = proc_info['pid']
+            if pid in seen:
+                continue
+            seen.add(pid)
+
+            # Alternate row colors for better readability
+            tag = 'evenrow' if len(desired) % 2 == 0 else 'oddrow'
+            row = (self.format_values(proc_info), tag)
+
+            item_id = self.items.get(pid)
+            if item_id is None:
+                item_id = tree.insert("", "end", text=str(pid), values=row[0], tags=(tag,))
+                self.items[pid] = item_id
+                inserted.append(item_id)
+            elif self.rows[pid] != row:
+                # Update only rows whose displayed cells changed
+                tree.item(item_id, values=row[0], tags=(tag,))
+            self.rows[pid] = row
+            desired.append(item_id)
+
+        # Delete processes that have exited
+        gone = [pid for pid in self.items if pid not in seen]
+        if gone:
+            gone_items = set()
+            for pid in gone:
+                gone_items.add(self.items.pop(pid))
+                del self.rows[pid]
+            tree.delete(*gone_items)
+            self.order = [item_id for item_id in self.order if item_id not in gone_items]
+
+        self.order.extend(inserted)
+        if self.order != desired:
+            self.reorder(desired)
+
+        # Moving rows may drop them from the selection, so restore it
+        if selection:
+            alive = [item_id for item_id in selection if tree.exists(item_id)]
+            if alive and tuple(tree.selection()) != tuple(alive):
+                tree.selection_set(alive)
+
+    # Move the smallest set of rows needed to reach the desired order
+    def reorder(self, desired):
+        # Rows on the longest run that is already in order stay where they are
+        position = {item_id: index for index, item_id in enumerate(desired)}
+        keep = longest_increasing_run([position[item_id] for item_id in self.order])
+        stay = {self.order[index] for index in keep}
+        moving = [item_id for item_id in desired if item_id not in stay]
+
+        # Detach the rows that move and re-attach them at their final index
+        self.tree.detach(*moving)
+        for item_id in moving:
+            self.tree.move(item_id, "", position[item_id])
+        self.order = list(desired)
+
+    # Remove process rows (e.g. after they were terminated)
+    def remove(self, pids):
+        removed = set()
+        for pid in pids:
+            item_id = self.items.pop(pid, None)
+            if item_id is not None:
+                del self.rows[pid]
+                removed.add(item_id)
+        if not removed:
+            return
+        self.order = [item_id for item_id in self.order if item_id not in removed]
+        self.tree.delete(*[item_id for item_id in removed if self.tree.exists(item_id)])
+
+    # Forget all rows
+    def clear(self):
+        if self.items:
+            self.tree.delete(*self.items.values())
+        self.items.clear()
+        self.rows.clear()
+        self.order.clear()
+
+# Milliseconds between UI frames that apply the work posted by the workers
+UI_FRAME_INTERVAL = 50
+
+# After this many frames without work, poll every UI_IDLE_INTERVAL ms instead;
+# while the window is hidden, poll every UI_HIDDEN_INTERVAL ms
+UI_IDLE_FRAMES = 20
+UI_IDLE_INTERVAL = 250
+UI_HIDDEN_INTERVAL = 1000
+
+# Above this many processes the "Auto" table mode switches to the virtual table
+VIRTUAL_TABLE_THRESHOLD = 1000
+
+# Windowed process table for very large process counts.
+# The Treeview only holds a fixed pool of row items (the visible rows plus a
+# small overscan). Rows are fed from the in-memory process list, and scrolling
+# rewrites the pool instead of scrolling the widget, so the refresh cost
+# depends on the window height rather than on the number of processes.
+class VirtualProcessTable:
+    def __init__(self, tree, scrollbar, overscan=2, row_height=25):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.overscan = overscan
+        self.row_height = row_height
+        self.rows = []  # sorted process info dicts (the model)
+        self.offset = 0  # index of the first row shown
+        self.visible = 20  # rows that fit into the widget
+        self.slots = []  # pooled Treeview item ids
+        self.slot_rows = []  # (pid, values, tag) last written to each slot
+        self.selected = set()  # selected PIDs, also those scrolled out of the window
+        self.expected_selection = ()  # selection as last set by render()
+        self.bindings = []
+
+    # Take over the Treeview and the scrollbar
+    def activate(self):
+        self.tree.configure(yscrollcommand="")
+        self.scrollbar.configure(command=self.on_scroll)
+        for sequence, handler in (("<MouseWheel>", self.on_mousewheel),
+                                  ("<Button-4>", self.on_mousewheel),
+                                  ("<Button-5>", self.on_mousewheel),
+                                  ("<Configure>", self.on_resize)):
+            self.bindings.append((sequence, self.tree.bind(sequence, handler, add="+")))
+
+    # Give the Treeview back in an empty state
+    def deactivate(self):
+        for sequence, funcid in self.bindings:
+            self.tree.unbind(sequence, funcid)
+        self.bindings.clear()
+        self.clear()
+
+    # Show a new sorted process list, keeping the scroll position
+    def reconcile(self, processes_sorted):
+        self.sync_selection()
+        self.rows = processes_sorted
+        self.render()
+
+    # Write the rows of the current window into the pooled items
+    def render(self):
+        tree = self.tree
+        total = len(self.rows)
+        self.offset = max(0, min(self.offset, total - self.visible))
+        window = self.rows[self.offset:self.offset + self.visible + self.overscan]
+
+        # Grow or shrink the pool to the number of rows in the window
+        while len(self.slots) < len(window):
+            self.slots.append(tree.insert("", "end", text=""))
+            self.slot_rows.append(None)
+        if len(self.slots) > len(window):
+            tree.delete(*self.slots[len(window):])
+            del self.slots[len(window):]
+            del self.slot_rows[len(window):]
+
+        selection = []
+        for index, proc_info in enumerate(window):
+            # Alternate row colors based on the absolute row index
+            tag = 'evenrow' if (self.offset + index) % 2 == 0 else 'oddrow'
+            row = (proc_info['pid'], ProcessTreeReconciler.format_values(proc_info), tag)
+            if self.slot_rows[index] != row:
+                tree.item(self.slots[index], text=str(row[0]), values=row[1], tags=(tag,))
+                self.slot_rows[index] = row
+            if row[0] in self.selected:
+                selection.append(self.slots[index])
+
+        # Keep the selection on the selected PID rather than on the slot
+        if tuple(tree.selection()) != tuple(selection):
+            tree.selection_set(selection)
+        self.expected_selection = tuple(tree.selection())
+
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    # Pick up selection changes made by the user since the last render.
+    # The user can only change rows inside the window, so selected rows
+    # scrolled out of it stay selected.
+    def sync_selection(self):
+        selection = tuple(self.tree.selection())
+        if selection != self.expected_selection:
+            self.expected_selection = selection
+            self.selected.difference_update(row[0] for row in self.slot_rows if row)
+            for item_id in selection:
+                index = self.slots.index(item_id)
+                if self.slot_rows[index]:
+                    self.selected.add(self.slot_rows[index][0])
+
+    # PIDs of the selected processes
+    def selected_pids(self):
+        self.sync_selection()
+        return [proc_info['pid'] for proc_info in self.rows if proc_info['pid'] in self.selected]
+
+    # Displayed name of a process, or None
+    def name_of(self, pid):
+        for proc_info in self.rows:
+            if proc_info['pid'] == pid:
+                return proc_info['name']
+        return None
+
+    # Scroll to a row offset
+    def scroll_to(self, offset):
+        offset = max(0, min(int(offset), len(self.rows) - self.visible))
+        if offset != self.offset:
+            self.sync_selection()
+            self.offset = offset
+            self.render()
+
+    # Scrollbar command ("moveto", fraction) or ("scroll", count, "units"/"pages")
+    def on_scroll(self, action, *args):
+        if action == "moveto":
+            self.scroll_to(float(args[0]) * len(self.rows))
+        elif action == "scroll":
+            count = int(args[0])
+            if args[1] == "pages":
+                count *= self.visible
+            self.scroll_to(self.offset + count)
+
+    # Scroll with the mouse wheel instead of letting the Treeview scroll its pool
+    def on_mousewheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return "break"
+
+    # Resize the pool when the widget height changes
+    def on_resize(self, event):
+        visible = max(1, event.height // self.row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.render()
+
+    # Remove process rows (e.g. after they were terminated)
+    def remove(self, pids):
+        pids = set(pids)
+        self.sync_selection()
+        self.rows = [proc_info for proc_info in self.rows if proc_info['pid'] not in pids]
+        self.selected.difference_update(pids)
+        self.render()
+
+    # Forget all rows
+    def clear(self):
+        if self.slots:
+            self.tree.delete(*self.slots)
+        self.slots.clear()
+        self.slot_rows.clear()
+        self.rows = []
+        self.offset = 0
+        self.expected_selection = ()
+
+# Hierarchical process view nesting every process under its parent (by ppid).
+# Parents show their own usage followed by the usage of their whole subtree.
+# Only expanded parents have their children in the widget: a collapsed parent
+# carries a single empty placeholder child so Tk draws the expand indicator,
+# and its subtree is inserted when it is opened.
+class ProcessTreeView:
+    def __init__(self, tree, scrollbar):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.model = ProcessTree([])
+        self.expanded = set()  # pids whose children are shown
+        self.items = {}  # pid -> Treeview item id
+        self.pids = {}  # Treeview item id -> pid
+        self.rows = {}  # pid -> (values, tag) last written to the tree
+        self.layout = {}  # parent item id -> child item ids last set
+        self.placeholders = {}  # pid -> placeholder item id of a collapsed parent
+        self.sort_column = None  # siblings are ordered by subtree usage for the usage columns
+        self.sort_reverse = False
+        self.bindings = []
+
+    # Let the Treeview scroll itself and follow expand/collapse
+    def activate(self):
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.configure(command=self.tree.yview)
+        for sequence, handler in (("<<TreeviewOpen>>", self.on_open),
+                                  ("<<TreeviewClose>>", self.on_close)):
+            self.bindings.append((sequence, self.tree.bind(sequence, handler, add="+")))
+
+    # Give the Treeview back in an empty state
+    def deactivate(self):
+        for sequence, funcid in self.bindings:
+            self.tree.unbind(sequence, funcid)
+        self.bindings.clear()
+        self.clear()
+
+    # PIDs of the selected processes
+    def selected_pids(self):
+        return [self.pids[item_id] for item_id in self.tree.selection() if item_id in self.pids]
+
+    # Displayed name of a process, or None
+    def name_of(self, pid):
+        proc_info = self.model.processes.get(pid)
+        return proc_info['name'] if proc_info else None
+
+    # Column values of a process, with the subtree totals for parents
+    def format_values(self, pid):
+        model = self.model
+        name, cpu_percent, memory_percent = ProcessTreeReconciler.format_values(model.processes[pid])
+        descendants = model.descendants[pid]
+        if not descendants:
+            return (name, cpu_percent, memory_percent)
+        return (f"{name} (+{descendants})",
+                f"{cpu_percent} ({model.total_cpu[pid]:.1f}%)",
+                f"{memory_percent} ({model.total_memory[pid]:.1f}%)")
+
+    # Order sibling processes for display
+    def ordered(self, pids):
+        if self.sort_column == "cpu_percent":
+            return sorted(pids, key=self.model.total_cpu.__getitem__, reverse=self.sort_reverse)
+        if self.sort_column == "memory_percent":
+            return sorted(pids, key=self.model.total_memory.__getitem__, reverse=self.sort_reverse)
+        return pids
+
+    # Show a new process snapshot
+    def reconcile(self, processes_sorted):
+        self.model = ProcessTree(processes_sorted)
+        self.render()
+
+    # Bring the tree in line with the model, touching only the visible nodes
+    def render(self):
+        tree = self.tree
+        model = self.model
+        selection = tree.selection()
+        layout = {"": []}
+        visible = set()
+
+        # Walk the expanded part of the hierarchy in display order
+        stack = [(pid, "") for pid in reversed(self.ordered(model.roots))]
+        while stack:
+            pid, parent_id = stack.pop()
+            visible.add(pid)
+
+            # Alternate row colors for better readability
+            tag = 'evenrow' if len(visible) % 2 == 1 else 'oddrow'
+            row = (self.format_values(pid), tag)
+
+            item_id = self.items.get(pid)
+            if item_id is None:
+                item_id = tree.insert(parent_id, "end", text=str(pid), values=row[0], tags=(tag,),
+                                      open=pid in self.expanded)
+                self.items[pid] = item_id
+                self.pids[item_id] = pid
+            elif self.rows[pid] != row:
+                # Update only rows whose displayed cells changed
+                tree.item(item_id, values=row[0], tags=(tag,))
+            self.rows[pid] = row
+            layout[parent_id].append(item_id)
+
+            children = model.children[pid]
+            placeholder = self.placeholders.get(pid)
+            if children and pid in self.expanded:
+                if placeholder is not None:
+                    del self.placeholders[pid]
+                    tree.delete(placeholder)
+                layout[item_id] = []
+                stack.extend((child, item_id) for child in reversed(self.ordered(children)))
+            elif children:
+                if placeholder is None:
+                    placeholder = self.placeholders[pid] = tree.insert(item_id, "end", text="")
+                layout[item_id] = [placeholder]
+            else:
+                if placeholder is not None:
+                    del self.placeholders[pid]
+                    tree.delete(placeholder)
+                layout[item_id] = []
+
+        # Re-link children whose parent or position changed, top-down so a row
+        # is never moved below one of its own descendants
+        for parent_id, children in layout.items():
+            if self.layout.get(parent_id) != children:
+                tree.set_children(parent_id, *children)
+        self.layout = layout
+
+        # Delete processes that exited or are now inside a collapsed subtree
+        gone = [pid for pid in self.items if pid not in visible]
+        if gone:
+            gone_items = []
+            for pid in gone:
+                item_id = self.items.pop(pid)
+                del self.pids[item_id]
+                del self.rows[pid]
+                self.placeholders.pop(pid, None)
+                gone_items.append(item_id)
+            tree.delete(*gone_items)
+
+        # Moving rows may drop them from the selection, so restore it
+        if selection:
+            alive = [item_id for item_id in selection if item_id in self.pids]
+            if tuple(tree.selection()) != tuple(alive):
+                tree.selection_set(alive)
+
+    # Insert the children of a parent when it is expanded
+    def on_open(self, event):
+        pid = self.pids.get(self.tree.focus())
+        if pid is not None:
+            self.expanded.add(pid)
+            self.render()
+
+    # Drop the items of a subtree when it is collapsed
+    def on_close(self, event):
+        pid = self.pids.get(self.tree.focus())
+        if pid is not None:
+            self.expanded.discard(pid)
+            self.render()
+
+    # Remove process rows (e.g. after they were terminated)
+    def remove(self, pids):
+        pids = set(pids)
+        self.model = ProcessTree([proc_info for pid, proc_info in self.model.processes.items() if pid not in pids])
+        self.render()
+
+    # Forget all rows
+    def clear(self):
+        if self.layout.get(""):
+            self.tree.delete(*self.layout[""])
+        self.items.clear()
+        self.pids.clear()
+        self.rows.clear()
+        self.layout = {}
+        self.placeholders.clear()
+
+# Return the indices of one longest strictly increasing subsequence of values
+def longest_increasing_run(values):
+    tails = []  # value at the end of the best run of each length
+    tail_indices = []
+    previous = [-1] * len(values)
+    for index, value in enumerate(values):
+        length = bisect.bisect_left(tails, value)
+        if length == len(tails):
+            tails.append(value)
+            tail_indices.append(index)
+        else:
+            tails[length] = value
+            tail_indices[length] = index
+        previous[index] = tail_indices[length - 1] if length else -1
+
+    run = []
+    index = tail_indices[-1] if tail_indices else -1
+    while index != -1:
+        run.append(index)
+        index = previous[index]
+    run.reverse()
+    return run
+
+# Hardware view backed by a per-field model. The text is a list of sections:
+# plain strings, or mappings whose items are shown as "key: value" lines.
+# prepare() lays the sections out as one string with the offset of every
+# value; it touches no widget, so it runs on the worker thread. commit()
+# applies a prepared layout on the Tk thread in one pass: values are rewritten
+# in place at their text marks when the structure is unchanged (keeping the
+# scroll position and text selection), otherwise the text is replaced by a
+# single insert.
+class HardwarePanel:
+    def __init__(self, textbox):
+        self.textbox = textbox
+        self.layout = None  # structure of the text currently shown
+        self.values = {}  # key -> value text currently shown
+        self.marks = {}  # key -> mark at the start of its value
+        self.timestamp = None  # timestamp of the snapshot shown
+
+    # Lay out sections as (structure, text, [(key, value, offset)])
+    @staticmethod
+    def prepare(sections):
+        layout = tuple(section if isinstance(section, str) else tuple(section) for section in sections)
+        parts = []
+        fields = []
+        offset = 0
+        for section in sections:
+            if isinstance(section, str):
+                parts.append(section)
+                offset += len(section)
+                continue
+            for key, value in section.items():
+                value = str(value)
+                label = f"{key}: "
+                fields.append((key, value, offset + len(label)))
+                line = f"{label}{value}\n"
+                parts.append(line)
+                offset += len(line)
+        return layout, "".join(parts), fields
+
+    # Show sections, updating values in place when the structure is unchanged
+    def show(self, sections, timestamp=None):
+        self.commit(self.prepare(sections), timestamp)
+
+    # Apply a prepared layout to the text box, unless it was taken from an
+    # older snapshot than the one already shown
+    def commit(self, prepared, timestamp=None):
+        if timestamp is not None:
+            if self.timestamp is not None and timestamp < self.timestamp:
+                return
+            self.timestamp = timestamp
+        layout, text, fields = prepared
+        textbox = self.textbox
+        textbox.configure(state="normal")  # Enable editing temporarily
+        if layout != self.layout:
+            self.rebuild(text, fields)
+            self.layout = layout
+        else:
+            for key, value, offset in fields:
+                self.set_value(key, value)
+        textbox.configure(state="disabled")  # Disable editing again
+
+    # Rewrite one value between its mark and its old length
+    def set_value(self, key, value):
+        old = self.values[key]
+        if value == old:
+            return
+        mark = self.marks[key]
+        self.textbox.delete(mark, f"{mark} + {len(old)} chars")
+        self.textbox.insert(mark, value)
+        self.values[key] = value
+
+    # Replace the whole text, keeping the scroll position
+    def rebuild(self, text, fields):
+        textbox = self.textbox
+        top = textbox.yview()[0]
+        for mark in self.marks.values():
+            textbox.mark_unset(mark)
+        self.marks.clear()
+        self.values.clear()
+
+        textbox.delete("0.0", "end")
+        textbox.insert("0.0", text)
+        for key, value, offset in fields:
+            mark = f"field{len(self.marks)}"
+            textbox.mark_set(mark, f"1.0 + {offset} chars")
+            textbox.mark_gravity(mark, "left")
+            self.marks[key] = mark
+            self.values[key] = value
+        textbox.yview_moveto(top)
+
+# Hands work from the worker threads to the Tk main thread.
+# publish(key, callback) keeps only the newest callback per key: state that
+# is superseded before the next frame is dropped and never drawn, so at most
+# one update per key is pending however fast the producers run. post(callback)
+# queues events that must all run, in order, through a bounded queue.
+# flush() runs on the Tk thread once per frame.
+class UIDispatcher:
+    def __init__(self, stop_event, maxsize=100):
+        self.stop_event = stop_event
+        self.lock = threading.Lock()
+        self.pending = {}  # key -> newest callback
+        self.events = queue.Queue(maxsize=maxsize)
+        self.superseded = 0  # updates dropped because a newer one arrived
+
+    # Replace the pending update for key; returns False on shutdown
+    def publish(self, key, callback):
+        with self.lock:
+            if key in self.pending:
+                self.superseded += 1
+            self.pending[key] = callback
+        return not self.stop_event.is_set()
+
+    # Queue an event, blocking while the queue is full; returns False on shutdown
+    def post(self, callback):
+        while not self.stop_event.is_set():
+            try:
+                self.events.put(callback, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    # Whether anything is waiting for the next frame
+    def busy(self):
+        return bool(self.pending) or not self.events.empty()
+
+    # Apply the newest state of every key, then queued events until the frame
+    # budget is spent; returns whether any work was done
+    def flush(self, budget):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        for callback in pending.values():
+            self.run(callback)
+        worked = bool(pending)
+        while not budget.exhausted():
+            try:
+                callback = self.events.get_nowait()
+            except queue.Empty:
+                break
+            worked = True
+            self.run(callback)
+        return worked
+
+    # Run one callback, logging its errors
+    @staticmethod
+    def run(callback):
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"Error in UI callback: {e}")
+
+# Main-thread time spent per UI frame. A frame is one pass over the queue of
+# callbacks posted by the workers; it stops taking new work once `budget`
+# seconds are used up and leaves the rest for the next frame. Recent frame
+# durations are kept so the rendering cost can be measured.
+class FrameBudget:
+    def __init__(self, budget=0.012, window=600):
+        self.budget = budget
+        self.durations = deque(maxlen=window)  # seconds, frames that did work
+        self.frames = 0
+        self.over_budget = 0
+        self.started = None
+
+    # Begin a frame
+    def start(self):
+        self.started = time.perf_counter()
+
+    # Whether the frame has used up its budget
+    def exhausted(self):
+        return time.perf_counter() - self.started >= self.budget
+
+    # End a frame that did work
+    def finish(self):
+        duration = time.perf_counter() - self.started
+        self.durations.append(duration)
+        self.frames += 1
+        if duration > self.budget:
+            self.over_budget += 1
+            logger.debug(f"UI frame took {duration * 1000:.1f} ms (budget {self.budget * 1000:.0f} ms)")
+
+    # Summary of the recent frames in milliseconds
+    def summary(self):
+        if not self.durations:
+            return {"frames": self.frames, "over_budget": self.over_budget}
+        return {
+            "frames": self.frames,
+            "over_budget": self.over_budget,
+            "mean_ms": round(sum(self.durations) / len(self.durations) * 1000, 2),
+            "max_ms": round(max(self.durations) * 1000, 2),
+        }
+
+# Time ranges selectable for the sparklines, in seconds
+HISTORY_RANGES = {"5 min": 300, "1 h": 3600, "24 h": 86400}
+
+# Small line chart of a metric's history. A redraw only moves the points of a
+# single canvas line, so its cost does not depend on how long the app has run.
+# With maximum=None the chart scales to its peak (at least 100).
+class Sparkline(ctk.CTkFrame):
+    def __init__(self, master, title, width=560, height=26, maximum=100):
+        super().__init__(master, fg_color="transparent")
+        self.title = title
+        self.width = width
+        self.height = height
+        self.maximum = maximum
+        self.points = None
+
+        self.label = ctk.CTkLabel(self, text=f"{title}: -", width=110, anchor="w")
+        self.label.pack(side="left")
+        self.canvas = tk.Canvas(self, width=width, height=height, highlightthickness=0, bg="#2b2b2b")
+        self.canvas.pack(side="left", fill="x", expand=True)
+        self.line = self.canvas.create_line(0, height, 0, height, fill="#1f8fff", width=1.5)
+
+    # Draw the samples right-aligned in a window of `capacity` samples
+    def draw(self, values, capacity):
+        text = f"{self.title}: {values[-1]:.1f}%" if values else f"{self.title}: -"
+        if self.label.cget("text") != text:
+            self.label.configure(text=text)
+
+        # Reduce to at most one point per pixel, keeping the peak of each bucket
+        step = max(1, -(-capacity // self.width))
+        if step > 1:
+            values = [max(values[i:i + step]) for i in range(len(values) % step, len(values), step)]
+            capacity //= step
+
+        if len(values) < 2:
+            points = [0, self.height, 0, self.height]
+        else:
+            x_step = self.width / max(1, capacity - 1)
+            x_start = self.width - (len(values) - 1) * x_step
+            maximum = self.maximum or max(100, max(values))
+            scale = (self.height - 2) / maximum
+            points = []
+            for index, value in enumerate(values):
+                points.append(round(x_start + index * x_step, 1))
+                points.append(round(self.height - 1 - min(value, maximum) * scale, 1))
+
+        if points != self.points:
+            self.canvas.coords(self.line, *points)
+            self.points = points
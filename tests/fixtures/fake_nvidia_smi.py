@@ -0,0 +1,33 @@
+# Stand-in for `nvidia-smi --query-gpu=... --format=csv,noheader,nounits --loop-ms=N`.
+# Prints two GPUs every loop; the second one reports "[N/A]" for the temperature.
+# Every start appends a line to $FAKE_NVIDIA_SMI_RUNS (if set); utilization is
+# 10 x the run number. With $FAKE_NVIDIA_SMI_EXIT_AFTER the first run exits
+# with code 1 after that many loops, later runs loop until they are terminated.
+import os
+import sys
+import time
+
+loop_ms = 1000
+for argument in sys.argv[1:]:
+    if argument.startswith("--loop-ms="):
+        loop_ms = int(argument.split("=", 1)[1])
+
+run = 1
+runs_file = os.environ.get("FAKE_NVIDIA_SMI_RUNS")
+if runs_file:
+    with open(runs_file, "a+") as f:
+        f.seek(0)
+        run = len(f.readlines()) + 1
+        f.write("run\n")
+
+exit_after = int(os.environ.get("FAKE_NVIDIA_SMI_EXIT_AFTER", 0)) if run == 1 else 0
+loops = 0
+while True:
+    utilization = 10 * run
+    print(f"0, 00000000:01:00.0, {utilization}, 55, 1024, 8192, Fake GPU 0")
+    print(f"1, 00000000:02:00.0, {utilization}, [N/A], 512, 4096, Fake GPU, Rev. B")
+    sys.stdout.flush()
+    loops += 1
+    if exit_after and loops >= exit_after:
+        sys.exit(1)
+    time.sleep(loop_ms / 1000)
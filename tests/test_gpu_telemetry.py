@@ -0,0 +1,125 @@
+import os
+import sys
+import time
+import types
+
+import pytest
+
+from pc_informations.pc_info import GpuTelemetryStream
+
+FAKE_NVIDIA_SMI = [sys.executable, os.path.join(os.path.dirname(__file__), "fixtures", "fake_nvidia_smi.py")]
+
+# Wait until condition() holds, or fail after timeout seconds
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("timed out waiting for GPU telemetry")
+        time.sleep(0.02)
+
+# A stream reading the fake nvidia-smi, without trying NVML first
+def fake_stream(**kwargs):
+    stream = GpuTelemetryStream(command=FAKE_NVIDIA_SMI, interval=0.05, restart_delay=0, **kwargs)
+    stream.run_nvml = lambda: False
+    return stream
+
+def test_parse_nvidia_smi_line():
+    sample = GpuTelemetryStream.parse_nvidia_smi_line("0, 00000000:01:00.0, 37, 61, 1024, 8192, NVIDIA GeForce RTX 3070\n")
+    assert sample == {
+        'index': 0,
+        'pci_address': "00000000:01:00.0",
+        'utilization': 37,
+        'temperature': 61,
+        'memory_used': 1024,
+        'memory_total': 8192,
+        'name': "NVIDIA GeForce RTX 3070",
+    }
+
+def test_parse_nvidia_smi_line_not_available():
+    sample = GpuTelemetryStream.parse_nvidia_smi_line("1, 00000000:02:00.0, [N/A], [Not Supported], 5, [N/A], Tesla, Rev. B")
+    assert sample['utilization'] is None
+    assert sample['temperature'] is None
+    assert sample['memory_used'] == 5
+    assert sample['memory_total'] is None
+    assert sample['name'] == "Tesla, Rev. B"
+
+def test_parse_nvidia_smi_line_rejects_garbage():
+    assert GpuTelemetryStream.parse_nvidia_smi_line("") is None
+    assert GpuTelemetryStream.parse_nvidia_smi_line("Failed to initialize NVML: Driver/library version mismatch") is None
+    assert GpuTelemetryStream.parse_nvidia_smi_line("[N/A], 0, 0, 0, 0, 0, name") is None
+
+def test_stream_samples_from_command():
+    stream = fake_stream()
+    stream.start()
+    try:
+        wait_for(lambda: len(stream.latest()) == 2)
+        first, second = stream.latest()
+        assert stream.source == "nvidia-smi"
+        assert (first['index'], first['name'], first['temperature'], first['memory_total']) == (0, "Fake GPU 0", 55, 8192)
+        assert (second['index'], second['name'], second['temperature']) == (1, "Fake GPU, Rev. B", None)
+        assert 'timestamp' in first
+    finally:
+        stream.stop()
+    assert stream.process.poll() is not None
+
+def test_stream_restarts_exited_command(tmp_path, monkeypatch):
+    runs = tmp_path / "runs"
+    monkeypatch.setenv("FAKE_NVIDIA_SMI_RUNS", str(runs))
+    monkeypatch.setenv("FAKE_NVIDIA_SMI_EXIT_AFTER", "2")
+    stream = fake_stream()
+    stream.start()
+    try:
+        wait_for(lambda: any(sample['utilization'] == 20 for sample in stream.latest()))
+    finally:
+        stream.stop()
+    assert runs.read_text().count("run") == 2
+    assert stream.process.poll() is not None
+    assert not stream.thread.is_alive()
+
+def test_stream_without_command_falls_through(tmp_path):
+    stream = GpuTelemetryStream(command=str(tmp_path / "missing-nvidia-smi"), sysfs_root=str(tmp_path))
+    stream.run_nvml = lambda: False
+    assert stream.run_nvidia_smi() is False
+    assert stream.run_sysfs() is False
+
+def test_stopped_stream_starts_no_command():
+    stream = fake_stream()
+    stream.stop_event.set()
+    assert stream.run_nvidia_smi() is True
+    assert stream.process is None
+
+# Minimal pynvml stand-in whose temperature query is not supported
+def fake_pynvml():
+    class NVMLError(Exception):
+        pass
+
+    def unsupported(*args):
+        raise NVMLError("Not Supported")
+
+    return types.SimpleNamespace(
+        NVMLError=NVMLError,
+        NVML_TEMPERATURE_GPU=0,
+        nvmlInit=lambda: None,
+        nvmlShutdown=lambda: None,
+        nvmlDeviceGetCount=lambda: 1,
+        nvmlDeviceGetHandleByIndex=lambda index: index,
+        nvmlDeviceGetMemoryInfo=lambda handle: types.SimpleNamespace(used=1024 ** 3, total=8 * 1024 ** 3),
+        nvmlDeviceGetPciInfo=lambda handle: types.SimpleNamespace(busId=b"00000000:01:00.0"),
+        nvmlDeviceGetName=lambda handle: b"Fake GPU",
+        nvmlDeviceGetUtilizationRates=lambda handle: types.SimpleNamespace(gpu=12),
+        nvmlDeviceGetTemperature=unsupported,
+    )
+
+def test_nvml_unsupported_field_is_none(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pynvml", fake_pynvml())
+    stream = GpuTelemetryStream(interval=0.05)
+    stream.start()
+    try:
+        wait_for(lambda: stream.latest())
+        sample, = stream.latest()
+    finally:
+        stream.stop()
+    assert stream.source == "nvml"
+    assert sample['temperature'] is None
+    assert (sample['utilization'], sample['memory_used'], sample['memory_total']) == (12, 1024, 8192)
+    assert (sample['name'], sample['pci_address']) == ("Fake GPU", "00000000:01:00.0")
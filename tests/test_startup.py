@@ -0,0 +1,35 @@
+import os
+import sys
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported where they are first needed
+HEAVY_MODULES = ["psutil", "cpuinfo", "subprocess", "tkinter", "customtkinter", "concurrent.futures"]
+
+# Cumulative import time budget for pc_informations.pc_info, in microseconds
+IMPORT_BUDGET_US = 150_000
+
+# Import the module in a fresh interpreter and return {module: cumulative microseconds}
+def import_times(module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative_us)
+    return times
+
+def test_heavy_modules_are_not_imported():
+    times = import_times("pc_informations.pc_info")
+    loaded = [name for name in HEAVY_MODULES if name in times]
+    assert not loaded, f"imported at startup: {loaded}"
+
+def test_import_time_budget():
+    times = import_times("pc_informations.pc_info")
+    cumulative = times["pc_informations.pc_info"] + times.get("pc_informations", 0)
+    assert cumulative < IMPORT_BUDGET_US, f"import took {cumulative / 1000:.1f} ms"
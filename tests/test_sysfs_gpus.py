@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from pc_informations import pc_info
+from pc_informations.pc_info import read_sysfs_gpus, sysfs_available
+
+# Write sysfs attribute files into a device directory
+def write_attributes(device_dir, **attributes):
+    for name, value in attributes.items():
+        (device_dir / name).write_text(f"{value}\n")
+
+# Add a PCI device under devices/ and link it from bus/pci/devices like the kernel does
+def add_pci_device(root, address, device_class, vendor, device, driver=None, **attributes):
+    device_dir = root / "devices" / "pci0000:00" / address
+    device_dir.mkdir(parents=True)
+    write_attributes(device_dir, **{"class": device_class, "vendor": vendor, "device": device}, **attributes)
+    if driver:
+        driver_dir = root / "bus" / "pci" / "drivers" / driver
+        driver_dir.mkdir(parents=True, exist_ok=True)
+        os.symlink(driver_dir, device_dir / "driver")
+    bus_dir = root / "bus" / "pci" / "devices"
+    bus_dir.mkdir(parents=True, exist_ok=True)
+    os.symlink(device_dir, bus_dir / address)
+    return device_dir
+
+# Add a DRM card for a device, with a connector whose device is the card itself
+def add_drm_card(root, card, device_dir):
+    card_dir = root / "class" / "drm" / card
+    card_dir.mkdir(parents=True)
+    os.symlink(device_dir, card_dir / "device")
+    connector_dir = root / "class" / "drm" / f"{card}-HDMI-A-1"
+    connector_dir.mkdir()
+    os.symlink(card_dir, connector_dir / "device")
+
+@pytest.fixture(autouse=True)
+def no_pci_ids(monkeypatch):
+    # Name devices from the built-in vendor table, whatever is installed on the host
+    monkeypatch.setattr(pc_info, "PCI_IDS_PATHS", [])
+    pc_info.lookup_pci_name.cache_clear()
+    yield
+    pc_info.lookup_pci_name.cache_clear()
+
+@pytest.fixture
+def sysfs(tmp_path):
+    amd = add_pci_device(
+        tmp_path, "0000:03:00.0", "0x030000", "0x1002", "0x73bf", driver="amdgpu",
+        mem_info_vram_total=17163091968, mem_info_vram_used=1073741824, gpu_busy_percent=42,
+    )
+    add_drm_card(tmp_path, "card0", amd)
+    add_pci_device(tmp_path, "0000:07:00.0", "0x030200", "0x10de", "0x20b0")  # No DRM driver bound
+    add_pci_device(tmp_path, "0000:00:14.0", "0x0c0330", "0x8086", "0xa36d", driver="xhci_hcd")  # USB controller
+    return tmp_path
+
+def test_sysfs_available(sysfs, tmp_path_factory):
+    assert sysfs_available(str(sysfs))
+    assert not sysfs_available(str(tmp_path_factory.mktemp("empty")))
+
+def test_finds_drm_cards_and_display_controllers(sysfs):
+    gpus = read_sysfs_gpus(str(sysfs))
+    assert [gpu['pci_address'] for gpu in gpus] == ["0000:03:00.0", "0000:07:00.0"]
+
+def test_drm_cards_without_pci_entry_and_connectors_skipped(sysfs):
+    (sysfs / "bus" / "pci" / "devices" / "0000:03:00.0").unlink()  # Only reachable through card0
+    gpus = read_sysfs_gpus(str(sysfs))
+    assert [gpu['pci_address'] for gpu in gpus] == ["0000:03:00.0", "0000:07:00.0"]
+
+def test_reads_driver_vram_and_utilization(sysfs):
+    amd, nvidia = read_sysfs_gpus(str(sysfs))
+    assert amd['vendor'] == "AMD"
+    assert amd['name'] == "AMD GPU [1002:73bf]"
+    assert amd['driver'] == "amdgpu"
+    assert amd['memory_total'] == 17163091968
+    assert amd['memory'] == "16.0 GB"
+    assert amd['memory_used'] == 1073741824
+    assert amd['utilization'] == 42
+
+    assert nvidia['vendor'] == "NVIDIA"
+    assert 'driver' not in nvidia
+    assert 'memory_total' not in nvidia
+    assert 'utilization' not in nvidia
+
+def test_missing_sysfs_yields_no_gpus(tmp_path):
+    assert read_sysfs_gpus(str(tmp_path)) == []